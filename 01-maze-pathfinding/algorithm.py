@@ -1,7 +1,16 @@
 import heapq
 import time
+from array import array
 from collections import deque
-from graphics import *
+import numpy as np
+from frontier import make_frontier
+
+# Distance of a cell that has not been reached yet
+UNREACHED = np.iinfo(np.int32).max
+
+# Slots of the fixed-size cache depth_limited_search keeps of the smallest g
+# each cell was reached with in a pass (8 bytes per slot)
+DLS_TABLE_SIZE = 1 << 16
 
 
 def heuristic(cell, goal):
@@ -11,159 +20,647 @@ def heuristic(cell, goal):
     return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
 
 
-def A_star(graph, start, goal, pathMap, ax2, ax3):
+def reconstruct_path(parent, current):
+    """
+    Reconstructs the path from the start to `current` by following `parent`,
+    where the start is its own parent.
+    """
+    final_path = [current]
+    while parent[current] != current:
+        current = int(parent[current])
+        final_path.append(current)
+    return final_path[::-1]
+
+
+def _finish(graph, parent, current, observer):
+    """
+    Rebuilds the path ending at `current` (or None) and hands it to the observer.
+    """
+    path = None if current is None else reconstruct_path(parent, current)
+    if observer is not None:
+        observer.show_path(None if path is None else [graph.cell(v) for v in path])
+    return path
+
+
+def A_star(graph, start, goal, observer=None, h=None, frontier="heap"):
+    """
+    A* search. `h(v, goal)` is the heuristic on flat cell ids and defaults
+    to the Manhattan distance. `frontier` picks the open set: "heap" or the
+    integer "bucket" queue (see frontier.py), which needs integer f-scores.
+    """
     start_time = time.time()
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {cell: float('inf') for cell in graph}
+    cols = graph.cols
+    start, goal = graph.index(start), graph.index(goal)
+    goal_x, goal_y = divmod(goal, cols)
+    open_set = make_frontier(frontier)
+    open_set.push(start, 0)
+    parent = np.full(graph.n, -1, dtype=np.int32)
+    parent[start] = start
+    g_score = np.full(graph.n, UNREACHED, dtype=np.int32)
     g_score[start] = 0
-    f_score = {cell: float('inf') for cell in graph}
-    f_score[start] = heuristic(start, goal)
+    closed = np.zeros(graph.n, dtype=bool)
     expanded_nodes = 0
-    pathMap[start[0], start[1]] = 70
+    if observer is not None:
+        observer.visit(graph.cell(start))
 
     while open_set:
-        _, current = heapq.heappop(open_set)
+        current = open_set.pop()
+        if closed[current]:
+            continue  # Stale entry left behind by a cheaper push
+        closed[current] = True
         expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
 
         if current == goal:
-            path = reconstruct_path(
-                came_from, current, pathMap, ax3, "A* Final Path", start, goal)
+            path = _finish(graph, parent, current, observer)
             elapsed_time = time.time() - start_time
             return len(path), expanded_nodes, elapsed_time
 
-        for neighbor in graph[current]:
-            tentative_g_score = g_score[current] + 1
+        tentative_g_score = int(g_score[current]) + 1
+        for neighbor in graph.neighbors(current):
             if tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
+                parent[neighbor] = current
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + \
-                    heuristic(neighbor, goal)
-                heapq.heappush(open_set, (f_score[neighbor], neighbor))
-                pathMap[neighbor[0], neighbor[1]] = 70  # Mark as searching
-                update_visualization(pathMap, ax2, "A* Search Progress")
+                x, y = divmod(neighbor, cols)
+                if h is None:
+                    h_score = abs(x - goal_x) + abs(y - goal_y)
+                else:
+                    h_score = h(neighbor, goal)
+                # Ties on f go to the deeper cell (smaller h)
+                open_set.push(neighbor, tentative_g_score + h_score, h_score)
+                if observer is not None:
+                    observer.visit((x, y))  # Mark as searching
 
+    _finish(graph, parent, None, observer)
     elapsed_time = time.time() - start_time
     return None, expanded_nodes, elapsed_time
 
 
-def bfs(graph, start, goal, pathMap, ax2, ax3):
+def weighted_a_star(graph, start, goal, observer=None, weight=1, frontier="bucket"):
+    """
+    A* over the cell costs of a weighted graph (the cost of a step is the
+    cost of the cell entered). The heuristic is the Manhattan distance times
+    the cheapest cell cost, which never overestimates; `weight` > 1 inflates
+    it, trading path cost (at most `weight` times the optimum) for fewer
+    expansions, and `weight` = 0 turns the search into Dijkstra's algorithm.
+    All scores are integers, so the default frontier is the bucket queue.
+
+    Returns the number of cells on the path like the other searches; its cost
+    is graph.path_cost(path).
+    """
     start_time = time.time()
+    cols, weights = graph.cols, graph.weights
+    start, goal = graph.index(start), graph.index(goal)
+    goal_x, goal_y = divmod(goal, cols)
+    scale = weight * graph.min_cost
+    open_set = make_frontier(frontier)
+    open_set.push(start, 0)
+    parent = np.full(graph.n, -1, dtype=np.int32)
+    parent[start] = start
+    g_score = [UNREACHED] * graph.n
+    g_score[start] = 0
+    closed = np.zeros(graph.n, dtype=bool)
+    expanded_nodes = 0
+    if observer is not None:
+        observer.visit(graph.cell(start))
+
+    while open_set:
+        current = open_set.pop()
+        if closed[current]:
+            continue  # Stale entry left behind by a cheaper push
+        closed[current] = True
+        expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
+
+        if current == goal:
+            path = _finish(graph, parent, current, observer)
+            elapsed_time = time.time() - start_time
+            return len(path), expanded_nodes, elapsed_time
+
+        g_current = g_score[current]
+        for neighbor in graph.neighbors(current):
+            tentative_g_score = g_current + weights[neighbor]
+            if tentative_g_score < g_score[neighbor]:
+                parent[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                x, y = divmod(neighbor, cols)
+                h_score = int(scale * (abs(x - goal_x) + abs(y - goal_y)))
+                open_set.push(neighbor, tentative_g_score + h_score, h_score)
+                if observer is not None:
+                    observer.visit((x, y))  # Mark as searching
+
+    _finish(graph, parent, None, observer)
+    elapsed_time = time.time() - start_time
+    return None, expanded_nodes, elapsed_time
+
+
+def dijkstra(graph, start, goal, observer=None, frontier="bucket"):
+    """
+    Dijkstra's algorithm over the cell costs of a weighted graph (Dial's
+    algorithm with the default bucket frontier).
+    """
+    return weighted_a_star(graph, start, goal, observer, weight=0, frontier=frontier)
+
+
+def _join_paths(graph, parent_fwd, parent_bwd, meet_fwd, meet_bwd, observer):
+    """
+    Joins the forward path start..meet_fwd with the backward path
+    meet_bwd..goal (meet_fwd == meet_bwd or the two are adjacent).
+    """
+    path = reconstruct_path(parent_fwd, meet_fwd)
+    backward = reconstruct_path(parent_bwd, meet_bwd)[::-1]
+    if backward[0] == path[-1]:
+        backward = backward[1:]
+    path += backward
+    if observer is not None:
+        observer.show_path([graph.cell(v) for v in path])
+    return path
+
+
+def bidirectional_A_star(graph, start, goal, observer=None):
+    """
+    A* run from both ends at once, always advancing the side with the smaller
+    open set. Every edge relaxed between the two searched regions gives a
+    candidate path of length mu; the search stops once the smallest f-score
+    on either open set can no longer beat mu.
+    """
+    start_time = time.time()
+    cols = graph.cols
+    start, goal = graph.index(start), graph.index(goal)
+    targets = (divmod(goal, cols), divmod(start, cols))  # Heuristic target per side
+    parents = (np.full(graph.n, -1, dtype=np.int32), np.full(graph.n, -1, dtype=np.int32))
+    g_scores = (np.full(graph.n, UNREACHED, dtype=np.int32), np.full(graph.n, UNREACHED, dtype=np.int32))
+    closed = (np.zeros(graph.n, dtype=bool), np.zeros(graph.n, dtype=bool))
+    open_sets = ([(0, 0, start)], [(0, 0, goal)])
+    for side, root in enumerate((start, goal)):
+        parents[side][root] = root
+        g_scores[side][root] = 0
+        if observer is not None:
+            observer.visit(graph.cell(root))
+    best, meeting = UNREACHED, None
+    if start == goal:
+        best, meeting = 0, (start, goal)
+    expanded_nodes = 0
+
+    while open_sets[0] and open_sets[1]:
+        if open_sets[0][0][0] >= best or open_sets[1][0][0] >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, parent, g_score = open_sets[side], parents[side], g_scores[side]
+        other_g_score = g_scores[1 - side]
+        target_x, target_y = targets[side]
+
+        _, _, current = heapq.heappop(open_set)
+        if closed[side][current]:
+            continue  # Stale entry left behind by a cheaper push
+        closed[side][current] = True
+        expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
+
+        tentative_g_score = int(g_score[current]) + 1
+        for neighbor in graph.neighbors(current):
+            if tentative_g_score < g_score[neighbor]:
+                parent[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                x, y = divmod(neighbor, cols)
+                h_score = abs(x - target_x) + abs(y - target_y)
+                heapq.heappush(open_set, (tentative_g_score + h_score, h_score, neighbor))
+                if observer is not None:
+                    observer.visit((x, y))  # Mark as searching
+            if other_g_score[neighbor] != UNREACHED:
+                total = tentative_g_score + int(other_g_score[neighbor])
+                if total < best:
+                    best = total
+                    meeting = (current, neighbor) if side == 0 else (neighbor, current)
+
+    if meeting is None:
+        _finish(graph, parents[0], None, observer)
+        return None, expanded_nodes, time.time() - start_time
+
+    path = _join_paths(graph, parents[0], parents[1], meeting[0], meeting[1], observer)
+    elapsed_time = time.time() - start_time
+    return len(path), expanded_nodes, elapsed_time
+
+
+def bfs(graph, start, goal, observer=None):
+    start_time = time.time()
+    start, goal = graph.index(start), graph.index(goal)
     queue = deque([start])
-    came_from = {start: None}
+    parent = np.full(graph.n, -1, dtype=np.int32)
+    parent[start] = start
     expanded_nodes = 0
-    pathMap[start[0], start[1]] = 70
+    if observer is not None:
+        observer.visit(graph.cell(start))
 
     while queue:
         current = queue.popleft()
         expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
 
         if current == goal:
-            path = reconstruct_path(
-                came_from, current, pathMap, ax3, "BFS Final Path", start, goal)
+            path = _finish(graph, parent, current, observer)
             elapsed_time = time.time() - start_time
             return len(path), expanded_nodes, elapsed_time
 
-        for neighbor in graph[current]:
-            if neighbor not in came_from:
-                came_from[neighbor] = current
+        for neighbor in graph.neighbors(current):
+            if parent[neighbor] == -1:
+                parent[neighbor] = current
                 queue.append(neighbor)
-                pathMap[neighbor[0], neighbor[1]] = 70  # Mark as searching
-                update_visualization(pathMap, ax2, "BFS Search Progress")
+                if observer is not None:
+                    observer.visit(graph.cell(neighbor))  # Mark as searching
 
+    _finish(graph, parent, None, observer)
     return None, expanded_nodes, time.time() - start_time
 
 
-def dfs(graph, start, goal, pathMap, ax2, ax3):
+def bidirectional_bfs(graph, start, goal, observer=None):
+    """
+    Level-synchronous BFS from both ends, always expanding the smaller
+    frontier one full level at a time. The first level that touches the other
+    side's visited cells is finished and the shortest joining edge found in
+    it is used, which keeps the path optimal.
+    """
+    start_time = time.time()
+    start, goal = graph.index(start), graph.index(goal)
+    parents = (np.full(graph.n, -1, dtype=np.int32), np.full(graph.n, -1, dtype=np.int32))
+    distances = (np.full(graph.n, -1, dtype=np.int32), np.full(graph.n, -1, dtype=np.int32))
+    frontiers = [[start], [goal]]
+    for side, root in enumerate((start, goal)):
+        parents[side][root] = root
+        distances[side][root] = 0
+        if observer is not None:
+            observer.visit(graph.cell(root))
+    expanded_nodes = 0
+    best, meeting = UNREACHED, None
+    if start == goal:
+        best, meeting = 0, (start, goal)
+
+    while meeting is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, distance = parents[side], distances[side]
+        other_distance = distances[1 - side]
+        next_frontier = []
+
+        for current in frontiers[side]:
+            expanded_nodes += 1
+            if observer is not None:
+                observer.expand(graph.cell(current))
+            next_distance = int(distance[current]) + 1
+            for neighbor in graph.neighbors(current):
+                if other_distance[neighbor] != -1:
+                    total = next_distance + int(other_distance[neighbor])
+                    if total < best:
+                        best = total
+                        meeting = (current, neighbor) if side == 0 else (neighbor, current)
+                if distance[neighbor] == -1:
+                    parent[neighbor] = current
+                    distance[neighbor] = next_distance
+                    next_frontier.append(neighbor)
+                    if observer is not None:
+                        observer.visit(graph.cell(neighbor))  # Mark as searching
+        frontiers[side] = next_frontier
+
+    if meeting is None:
+        _finish(graph, parents[0], None, observer)
+        return None, expanded_nodes, time.time() - start_time
+
+    path = _join_paths(graph, parents[0], parents[1], meeting[0], meeting[1], observer)
+    elapsed_time = time.time() - start_time
+    return len(path), expanded_nodes, elapsed_time
+
+
+def dfs(graph, start, goal, observer=None):
     start_time = time.time()
+    start, goal = graph.index(start), graph.index(goal)
     stack = [start]
-    came_from = {start: None}
+    parent = np.full(graph.n, -1, dtype=np.int32)
+    parent[start] = start
     expanded_nodes = 0
-    pathMap[start[0], start[1]] = 70
+    if observer is not None:
+        observer.visit(graph.cell(start))
 
     while stack:
         current = stack.pop()
         expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
 
         if current == goal:
-            path = reconstruct_path(
-                came_from, current, pathMap, ax3, "DFS Final Path", start, goal)
+            path = _finish(graph, parent, current, observer)
             elapsed_time = time.time() - start_time
             return len(path), expanded_nodes, elapsed_time
 
-        for neighbor in graph[current]:
-            if neighbor not in came_from:
-                came_from[neighbor] = current
+        for neighbor in graph.neighbors(current):
+            if parent[neighbor] == -1:
+                parent[neighbor] = current
                 stack.append(neighbor)
-                pathMap[neighbor[0], neighbor[1]] = 70  # Mark as searching
-                update_visualization(pathMap, ax2, "DFS Search Progress")
+                if observer is not None:
+                    observer.visit(graph.cell(neighbor))  # Mark as searching
 
+    _finish(graph, parent, None, observer)
     elapsed_time = time.time() - start_time
     return None, expanded_nodes, elapsed_time
 
 
-def greedy(graph, start, goal, pathMap, ax2, ax3):
+def _jump_vertical(free, cols, n, goal, current, step):
+    """
+    Walks from `current` in the vertical direction `step` (+-cols) and returns
+    the first jump point: the goal, or a cell whose left or right neighbor is
+    free while the cell diagonally behind it is blocked. Returns None when a
+    wall or the border is hit first.
+    """
+    while True:
+        behind = current
+        current += step
+        if current < 0 or current >= n or not free[current]:
+            return None
+        if current == goal:
+            return current
+        y = current % cols
+        if y > 0 and free[current - 1] and not free[behind - 1]:
+            return current
+        if y < cols - 1 and free[current + 1] and not free[behind + 1]:
+            return current
+
+
+def _jump_horizontal(free, cols, n, goal, current, step):
+    """
+    Walks from `current` in the horizontal direction `step` (+-1) and returns
+    the first cell that is the goal or from which a vertical jump finds a jump
+    point. Returns None when a wall or the border is hit first.
+    """
+    y = current % cols
+    while True:
+        y += step
+        if y < 0 or y >= cols or not free[current + step]:
+            return None
+        current += step
+        if current == goal:
+            return current
+        if (_jump_vertical(free, cols, n, goal, current, cols) is not None or
+                _jump_vertical(free, cols, n, goal, current, -cols) is not None):
+            return current
+
+
+def jump_point_search(graph, start, goal, observer=None):
+    """
+    Jump Point Search for the 4-connected uniform-cost grid.
+
+    Among equally short paths only the canonical one that turns from vertical
+    to horizontal movement as late as obstacles allow is followed. Moving
+    horizontally may turn vertical at any cell; moving vertically only turns
+    at forced neighbors. Straight runs are skipped by the jump functions, so
+    only jump points reach the heap. A node is a (cell, axis) pair because the
+    successors of a cell depend on the axis it was reached along.
+    """
     start_time = time.time()
-    open_set = []
-    heapq.heappush(open_set, (heuristic(start, goal), start))
-    came_from = {start: None}
+    free, cols, n = graph.free, graph.cols, graph.n
+    start, goal = graph.index(start), graph.index(goal)
+    goal_x, goal_y = divmod(goal, cols)
+    HORIZONTAL, VERTICAL, ROOT = 0, 1, 2
+    root = start * 3 + ROOT
+    open_set = [(0, 0, root)]
+    g_score = {root: 0}
+    parent = {root: root}
+    closed = set()
     expanded_nodes = 0
-    pathMap[start[0], start[1]] = 70
+    if observer is not None:
+        observer.visit(graph.cell(start))
 
     while open_set:
-        _, current = heapq.heappop(open_set)
+        _, _, node = heapq.heappop(open_set)
+        if node in closed:
+            continue  # Stale entry left behind by a cheaper push
+        closed.add(node)
         expanded_nodes += 1
+        current, axis = divmod(node, 3)
+        if observer is not None:
+            observer.expand(graph.cell(current))
 
         if current == goal:
-            path = reconstruct_path(
-                came_from, current, pathMap, ax3, "Greedy Final Path", start, goal)
+            # Expand the jump points back into the straight runs between them
+            jump_points = reconstruct_path(parent, node)
+            path = [start]
+            for jump_point in jump_points[1:]:
+                cell = jump_point // 3
+                step = cols if abs(cell - path[-1]) >= cols else 1
+                step = step if cell > path[-1] else -step
+                path.extend(range(path[-1] + step, cell + step, step))
+            if observer is not None:
+                observer.show_path([graph.cell(v) for v in path])
             elapsed_time = time.time() - start_time
             return len(path), expanded_nodes, elapsed_time
 
-        for neighbor in graph[current]:
-            if neighbor not in came_from:
-                came_from[neighbor] = current
-                heapq.heappush(open_set, (heuristic(neighbor, goal), neighbor))
-                pathMap[neighbor[0], neighbor[1]] = 70  # Mark as searching
-                update_visualization(pathMap, ax2, "Greedy Search Progress")
+        successors = []
+        if axis != VERTICAL:
+            successors.append((_jump_vertical(free, cols, n, goal, current, cols), VERTICAL))
+            successors.append((_jump_vertical(free, cols, n, goal, current, -cols), VERTICAL))
+        if axis == ROOT:
+            successors.append((_jump_horizontal(free, cols, n, goal, current, 1), HORIZONTAL))
+            successors.append((_jump_horizontal(free, cols, n, goal, current, -1), HORIZONTAL))
+        else:
+            # Keep moving the same way we arrived
+            previous = parent[node] // 3
+            if axis == HORIZONTAL:
+                step = 1 if current > previous else -1
+                successors.append((_jump_horizontal(free, cols, n, goal, current, step), HORIZONTAL))
+            else:
+                step = cols if current > previous else -cols
+                successors.append((_jump_vertical(free, cols, n, goal, current, step), VERTICAL))
+                # Forced horizontal turns around the end of a wall
+                y = current % cols
+                for side in (-1, 1):
+                    if (0 <= y + side < cols and free[current + side] and
+                            not free[current - step + side]):
+                        successors.append(
+                            (_jump_horizontal(free, cols, n, goal, current, side), HORIZONTAL))
 
+        g_current = g_score[node]
+        for successor, successor_axis in successors:
+            if successor is None:
+                continue
+            x, y = divmod(successor, cols)
+            if successor_axis == VERTICAL:
+                tentative_g_score = g_current + abs(successor - current) // cols
+            else:
+                tentative_g_score = g_current + abs(successor - current)
+            successor_node = successor * 3 + successor_axis
+            if tentative_g_score < g_score.get(successor_node, UNREACHED):
+                g_score[successor_node] = tentative_g_score
+                parent[successor_node] = node
+                h_score = abs(x - goal_x) + abs(y - goal_y)
+                heapq.heappush(open_set, (tentative_g_score + h_score, h_score, successor_node))
+                if observer is not None:
+                    observer.visit((x, y))  # Mark as searching
+
+    if observer is not None:
+        observer.show_path(None)
     elapsed_time = time.time() - start_time
     return None, expanded_nodes, elapsed_time
 
 
-def depth_limited_search(graph, current, goal, depth, came_from, pathMap, ax2, expanded_nodes):
-    if depth == 0:
-        return None
-    if current == goal:
-        return [current]
-    for neighbor in graph[current]:
-        if neighbor not in came_from:
-            came_from[neighbor] = current
-            expanded_nodes += 1
-            pathMap[neighbor[0], neighbor[1]] = 70  # Mark as searching
-            update_visualization(pathMap, ax2, "IDS Search Progress")
-            result = depth_limited_search(
-                graph, neighbor, goal, depth - 1, came_from, pathMap, ax2, expanded_nodes)
-            if result is not None:
-                return [current] + result
-    return None
+def greedy(graph, start, goal, observer=None, frontier="heap"):
+    """
+    Greedy best-first search on the Manhattan distance; `frontier` is "heap"
+    or "bucket" as in A_star.
+    """
+    start_time = time.time()
+    cols = graph.cols
+    start, goal = graph.index(start), graph.index(goal)
+    goal_x, goal_y = divmod(goal, cols)
+    open_set = make_frontier(frontier)
+    open_set.push(start, heuristic(graph.cell(start), (goal_x, goal_y)), start)
+    parent = np.full(graph.n, -1, dtype=np.int32)
+    parent[start] = start
+    expanded_nodes = 0
+    if observer is not None:
+        observer.visit(graph.cell(start))
+
+    while open_set:
+        current = open_set.pop()
+        expanded_nodes += 1
+        if observer is not None:
+            observer.expand(graph.cell(current))
 
+        if current == goal:
+            path = _finish(graph, parent, current, observer)
+            elapsed_time = time.time() - start_time
+            return len(path), expanded_nodes, elapsed_time
 
-def iterative_deepening_search(graph, start, goal, pathMap, ax2, ax3):
+        for neighbor in graph.neighbors(current):
+            if parent[neighbor] == -1:
+                parent[neighbor] = current
+                x, y = divmod(neighbor, cols)
+                open_set.push(neighbor, abs(x - goal_x) + abs(y - goal_y), neighbor)
+                if observer is not None:
+                    observer.visit((x, y))  # Mark as searching
+
+    _finish(graph, parent, None, observer)
+    elapsed_time = time.time() - start_time
+    return None, expanded_nodes, elapsed_time
+
+
+def depth_limited_search(graph, start, goal, bound, observer=None, h=None, table_size=DLS_TABLE_SIZE):
+    """
+    Depth-first search from `start` that prunes every cell whose f = g + h
+    exceeds `bound`, with `h(v)` on flat cell ids (zero when None).
+
+    The recursion is replaced by an explicit stack holding the current path
+    and one neighbor iterator per cell on it, and the cells on that path are
+    never re-entered. On mazes with loops, a fixed-size cache remembers the
+    smallest g a cell was reached with in this pass (one slot per
+    `cell % table_size`, the newest cell winning) and skips a cell reached
+    again with g' >= g, so most cells are searched again only along a shorter
+    path. Memory is the path depth plus the `table_size` slots (rounded down
+    to a power of two, 0 disables the cache), whatever the maze size.
+
+    Returns (path, next_bound, expanded_nodes): the path of flat ids to the
+    goal or None, and the smallest f-score pruned in this pass (UNREACHED when
+    nothing was pruned, i.e. a larger bound finds nothing new).
+    """
+    if h is None:
+        h = lambda v: 0
+    path = [start]
+    on_path = {start}
+    expanded_nodes = 1
+    if observer is not None:
+        observer.expand(graph.cell(start))
+    if start == goal:
+        return path, bound, expanded_nodes
+    size = 1 << (table_size.bit_length() - 1) if table_size > 0 else 0
+    mask = size - 1
+    cached_cells = array('i', [-1]) * size
+    cached_g = array('i', [0]) * size
+    stack = [iter(graph.neighbors(start))]
+    next_bound = UNREACHED
+
+    while stack:
+        neighbor = next(stack[-1], None)
+        if neighbor is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if neighbor in on_path:
+            continue
+        g_score = len(path)  # g(neighbor) is the path length so far
+        if size:
+            slot = neighbor & mask
+            if cached_cells[slot] == neighbor and cached_g[slot] <= g_score:
+                continue  # Already searched from at most this far
+        f_score = g_score + h(neighbor)
+        if f_score > bound:
+            if f_score < next_bound:
+                next_bound = f_score
+            continue
+        path.append(neighbor)
+        on_path.add(neighbor)
+        if size:
+            cached_cells[slot] = neighbor
+            cached_g[slot] = g_score
+        expanded_nodes += 1
+        if observer is not None:
+            cell = graph.cell(neighbor)
+            observer.visit(cell)  # Mark as searching
+            observer.expand(cell)
+        if neighbor == goal:
+            return path, bound, expanded_nodes
+        stack.append(iter(graph.neighbors(neighbor)))
+
+    return None, next_bound, expanded_nodes
+
+
+def _iterative_deepening(graph, start, goal, observer, h, table_size):
+    """
+    Runs depth_limited_search with growing bounds, each time raising the
+    bound to the smallest f-score the previous pass pruned.
+    """
     start_time = time.time()
-    depth = 0
+    start, goal = graph.index(start), graph.index(goal)
+    bound = h(start) if h is not None else 0
     expanded_nodes = 0
-    pathMap[start[0], start[1]] = 70
+    if observer is not None:
+        observer.visit(graph.cell(start))
 
     while True:
-        came_from = {start: None}
-        expanded_nodes += 1
-        result = depth_limited_search(
-            graph, start, goal, depth, came_from, pathMap, ax2, expanded_nodes)
-        if result is not None:
-            path = reconstruct_path(
-                came_from, goal, pathMap, ax3, "IDS Final Path", start, goal)
+        path, bound, expanded = depth_limited_search(graph, start, goal, bound, observer, h, table_size)
+        expanded_nodes += expanded  # Cells expanded in this pass
+        if path is not None:
+            if observer is not None:
+                observer.show_path([graph.cell(v) for v in path])
             elapsed_time = time.time() - start_time
             return len(path), expanded_nodes, elapsed_time
-        depth += 1
+        if bound == UNREACHED:
+            break  # The last pass pruned nothing: the goal is unreachable
+
+    _finish(graph, None, None, observer)
+    elapsed_time = time.time() - start_time
+    return None, expanded_nodes, elapsed_time
+
+
+def iterative_deepening_search(graph, start, goal, observer=None, table_size=DLS_TABLE_SIZE):
+    """
+    Iterative deepening depth-first search, one depth level per pass.
+    `table_size` is the re-expansion cache budget of depth_limited_search.
+    """
+    return _iterative_deepening(graph, start, goal, observer, None, table_size)
+
+
+def ida_star(graph, start, goal, observer=None, table_size=DLS_TABLE_SIZE):
+    """
+    Iterative deepening A* with the Manhattan distance: every pass searches
+    the cells with f = g + h up to the next f-contour, which skips the depth
+    levels a consistent heuristic already rules out. `table_size` is the
+    re-expansion cache budget of depth_limited_search.
+    """
+    goal_x, goal_y = graph.cell(graph.index(goal))
+    cols = graph.cols
+
+    def h(v):
+        x, y = divmod(v, cols)
+        return abs(x - goal_x) + abs(y - goal_y)
+
+    return _iterative_deepening(graph, start, goal, observer, h, table_size)
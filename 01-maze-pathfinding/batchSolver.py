@@ -0,0 +1,140 @@
+"""
+Batch solver for many (maze, start, goal, algorithm) jobs.
+
+Every maze is copied once into a shared memory block; the worker processes
+attach to those blocks when they start, so a job only carries its maze name
+and endpoints. Jobs are sent in chunks and results are yielded as soon as
+each chunk finishes. Every job is searched, even a repeated one, so the
+metrics of identical jobs do not depend on which worker ran them.
+
+Job file format (JSON):
+    {
+        "mazes": {"small": "mazes/prims-101-0.maze"},
+        "jobs": [{"maze": "small", "start": [0, 0], "goal": [100, 100], "algorithm": "a*"}]
+    }
+
+Example:
+    python batchSolver.py jobs.json --workers 8 -o results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+import numpy as np
+from main import ALGORITHMS, mat2graph, solve
+from mazeStorage import load_maze
+
+# Per-worker state, filled by _init_worker
+_SEGMENTS = {}
+_GRAPHS = {}
+
+
+def _init_worker(layouts):
+    for name, (segment_name, shape) in layouts.items():
+        _SEGMENTS[name] = (shared_memory.SharedMemory(name=segment_name), shape)
+
+
+def _graph(name):
+    """Builds (once per worker) the grid graph of a shared maze."""
+    if name not in _GRAPHS:
+        segment, shape = _SEGMENTS[name]
+        maze = np.ndarray(shape, dtype=bool, buffer=segment.buf)
+        _GRAPHS[name] = mat2graph(maze)
+    return _GRAPHS[name]
+
+
+def _solve_chunk(chunk):
+    results = []
+    for index, (name, start, goal, algorithm) in chunk:
+        # No path cache: a hit would report different metrics than a search
+        path_length, expanded_nodes, elapsed = solve(algorithm, _graph(name), tuple(start), tuple(goal),
+                                                     cache=None)
+        results.append({"job": index, "maze": name, "start": list(start), "goal": list(goal),
+                        "algorithm": algorithm, "path_length": path_length,
+                        "expanded_nodes": expanded_nodes, "elapsed": elapsed})
+    return results
+
+
+def solve_batch(mazes, jobs, max_workers=None, chunk_size=16):
+    """
+    Solves `jobs` over a process pool and yields one result dict per job, in
+    completion order.
+
+    :param mazes: Dict of maze name -> boolean maze array (True = free).
+    :param jobs: Iterable of (maze name, start, goal, algorithm) tuples.
+    :param max_workers: Number of worker processes (defaults to the CPU count).
+    :param chunk_size: Jobs sent to a worker at a time.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    segments = {}
+    try:
+        layouts = {}
+        for name, maze in mazes.items():
+            maze = np.asarray(maze) != 0
+            segment = shared_memory.SharedMemory(create=True, size=max(maze.nbytes, 1))
+            np.ndarray(maze.shape, dtype=bool, buffer=segment.buf)[...] = maze
+            segments[name] = segment
+            layouts[name] = (segment.name, maze.shape)
+
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                 initargs=(layouts,)) as executor:
+            pending = set()
+            chunk = []
+            # Keep a few chunks per worker in flight instead of submitting
+            # the whole job list up front
+            for index, job in enumerate(jobs):
+                chunk.append((index, job))
+                if len(chunk) == chunk_size:
+                    pending.add(executor.submit(_solve_chunk, chunk))
+                    chunk = []
+                while len(pending) >= 4 * max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+            if chunk:
+                pending.add(executor.submit(_solve_chunk, chunk))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+    finally:
+        for segment in segments.values():
+            segment.close()
+            segment.unlink()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a batch of maze queries in parallel.")
+    parser.add_argument("jobs", help="JSON job file (see the module docstring)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("-o", "--output", help="Write JSON lines to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    with open(args.jobs) as stream:
+        spec = json.load(stream)
+    base = os.path.dirname(os.path.abspath(args.jobs))
+    mazes = {name: load_maze(os.path.join(base, path)).to_array()
+             for name, path in spec["mazes"].items()}
+    jobs = [(job["maze"], job["start"], job["goal"], job["algorithm"].lower())
+            for job in spec["jobs"]]
+    for maze, _, _, algorithm in jobs:
+        if maze not in mazes:
+            parser.error(f"unknown maze {maze!r}")
+        if algorithm not in ALGORITHMS:
+            parser.error(f"unknown algorithm {algorithm!r}")
+
+    stream = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for result in solve_batch(mazes, jobs, args.workers, args.chunk_size):
+            stream.write(json.dumps(result) + "\n")
+            stream.flush()
+    finally:
+        if args.output:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
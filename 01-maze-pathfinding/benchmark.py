@@ -0,0 +1,182 @@
+"""
+Headless benchmark of the maze search algorithms.
+
+Sweeps maze sizes and seeds, runs every selected algorithm from the top-left
+to the bottom-right corner and records path length, path cost, expanded
+nodes, wall time, peak memory and nodes per second for each run as JSON or
+CSV. For the algorithms that precompute a structure per maze (junction-a*,
+alt-a*) the precomputation is timed and measured in its own columns, and
+the search columns cover the query alone.
+
+Example:
+    python benchmark.py --sizes 51 101 201 --seeds 0 1 2 --format csv -o results.csv
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from mazeGenerator import PrimsMaze, KruskalMaze, terrain_costs
+from main import ALGORITHMS, mat2graph
+from mazeStorage import save_maze, load_maze
+from junctionGraph import JunctionGraph
+from landmarks import Landmarks
+from pathCache import PathRecorder
+
+GENERATORS = {
+    "prims": PrimsMaze,
+    "kruskal": KruskalMaze,
+}
+
+# Per-maze structures an algorithm builds on first use and caches on the graph
+PRECOMPUTE = {
+    "junction-a*": JunctionGraph.of,
+    "alt-a*": Landmarks.of,
+}
+
+FIELDS = ["generator", "size", "seed", "algorithm", "path_length", "cost", "expanded_nodes",
+          "wall_time", "peak_memory_bytes", "nodes_per_second",
+          "precompute_time", "precompute_memory_bytes"]
+
+
+def generate_maze(generator, size, seed, corpus=None):
+    """
+    Generates a maze, or loads it from the `corpus` directory of packed maze
+    files when it was generated before (saving it there otherwise).
+    """
+    path = None
+    if corpus is not None:
+        path = os.path.join(corpus, f"{generator}-{size}-{seed}.maze")
+        if os.path.exists(path):
+            return load_maze(path).to_array()
+    # Keep the generator's progress message out of the machine-readable output
+    with contextlib.redirect_stdout(sys.stderr):
+        maze = GENERATORS[generator](size, show_maze=False, seed=seed).create_maze((0, 0))
+    if path is not None:
+        os.makedirs(corpus, exist_ok=True)
+        save_maze(path, maze, seed)
+    return maze
+
+
+def precompute(algorithm, graph, measure_memory=True):
+    """
+    Builds the per-maze structure of `algorithm` into the graph's cache and
+    returns (build time, peak memory of the build), or (None, None) when the
+    algorithm has none. Like run_once, the memory comes from a separate
+    traced build, made against an empty cache that is thrown away.
+    """
+    build = PRECOMPUTE.get(algorithm)
+    if build is None:
+        return None, None
+    peak_memory = None
+    if measure_memory:
+        cache, graph.cache = graph.cache, {}
+        tracemalloc.start()
+        build(graph)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        graph.cache = cache
+    begin = time.perf_counter()
+    build(graph)
+    return time.perf_counter() - begin, peak_memory
+
+
+def run_once(algorithm, graph, start, goal, measure_memory=True):
+    """
+    Runs one search and returns its metrics. The per-maze precomputation is
+    done (and measured) first, so the search metrics cover the query alone.
+    The wall time comes from a run without tracemalloc, which would otherwise
+    slow the search down; the peak memory from a second, traced run, which
+    also records the path for its cost (the sum of the entered cells' costs).
+    """
+    search = ALGORITHMS[algorithm]
+    precompute_time, precompute_memory = precompute(algorithm, graph, measure_memory)
+    begin = time.perf_counter()
+    path_length, expanded_nodes, _ = search(graph, start, goal)
+    wall_time = time.perf_counter() - begin
+
+    peak_memory = None
+    recorder = PathRecorder()
+    if measure_memory:
+        tracemalloc.start()
+        search(graph, start, goal, recorder)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        search(graph, start, goal, recorder)
+
+    return {
+        "path_length": path_length,
+        "cost": None if recorder.path is None else graph.path_cost(recorder.path),
+        "expanded_nodes": expanded_nodes,
+        "wall_time": wall_time,
+        "peak_memory_bytes": peak_memory,
+        "nodes_per_second": expanded_nodes / wall_time if wall_time > 0 else None,
+        "precompute_time": precompute_time,
+        "precompute_memory_bytes": precompute_memory,
+    }
+
+
+def run_benchmark(sizes, seeds, algorithms, generator="prims", measure_memory=True, ids_max_size=101,
+                  corpus=None, terrain=False):
+    """
+    Yields one record per (size, seed, algorithm). IDS is skipped above
+    `ids_max_size`, where its repeated deepening takes too long. With
+    `terrain`, the mazes get seeded mud and water costs.
+    """
+    for size in sizes:
+        for seed in seeds:
+            maze = generate_maze(generator, size, seed, corpus)
+            graph = mat2graph(maze, terrain_costs(maze, seed) if terrain else None)
+            start, goal = (0, 0), (maze.shape[0] - 1, maze.shape[1] - 1)
+            for algorithm in algorithms:
+                if algorithm == "ids" and size > ids_max_size:
+                    continue
+                record = {"generator": generator, "size": int(maze.shape[0]),
+                          "seed": seed, "algorithm": algorithm}
+                record.update(run_once(algorithm, graph, start, goal, measure_memory))
+                yield record
+
+
+def write_records(records, fmt, stream):
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+    else:
+        json.dump(list(records), stream, indent=2)
+        stream.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze search algorithms.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[21, 51, 101])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--algorithms", nargs="+", default=["a*", "bfs", "dfs", "greedy", "ids"],
+                        choices=sorted(ALGORITHMS))
+    parser.add_argument("--generator", default="prims", choices=sorted(GENERATORS))
+    parser.add_argument("--format", default="json", choices=["json", "csv"])
+    parser.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--ids-max-size", type=int, default=101,
+                        help="Skip IDS on mazes larger than this")
+    parser.add_argument("--corpus", help="Directory of packed mazes to reuse (created on first run)")
+    parser.add_argument("--terrain", action="store_true",
+                        help="Add mud and water cell costs (used by dijkstra and weighted-a*)")
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.sizes, args.seeds, args.algorithms, args.generator,
+                            not args.no_memory, args.ids_max_size, args.corpus, args.terrain)
+    if args.output:
+        with open(args.output, "w", newline="") as stream:
+            write_records(records, args.format, stream)
+    else:
+        write_records(records, args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import numpy as np
+from gridGraph import DIRECTIONS
+
+
+def distance_field(maze, source):
+    """
+    Breadth-first distance field from the `source` (x, y) cell of a maze.
+
+    Instead of popping one cell at a time, the whole frontier is advanced at
+    once: the frontier holds flat ids into a copy of the maze padded with a
+    wall border, so each direction's step is a single array addition followed
+    by a mask lookup of the still-unvisited free cells.
+
+    Returns (distance, direction): int32 distances with -1 for unreachable
+    cells, and int8 indices into DIRECTIONS giving the step taken to enter
+    each cell (-1 for the source and unreachable cells).
+    """
+    maze = np.asarray(maze) != 0
+    rows, cols = maze.shape
+    width = cols + 2
+    unvisited = np.zeros((rows + 2, width), dtype=bool)
+    unvisited[1:-1, 1:-1] = maze
+    unvisited = unvisited.ravel()
+    distance = np.full(unvisited.size, -1, dtype=np.int32)
+    direction = np.full(unvisited.size, -1, dtype=np.int8)
+    offsets = [dx * width + dy for dx, dy in DIRECTIONS]
+
+    source = (source[0] + 1) * width + source[1] + 1
+    if unvisited[source]:
+        unvisited[source] = False
+        distance[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+    else:
+        frontier = np.empty(0, dtype=np.int64)
+
+    level = 0
+    while frontier.size:
+        level += 1
+        reached = []
+        for code, offset in enumerate(offsets):
+            candidates = frontier + offset
+            candidates = candidates[unvisited[candidates]]
+            if candidates.size:
+                # A shift is one-to-one, so there are no duplicates to remove
+                unvisited[candidates] = False
+                distance[candidates] = level
+                direction[candidates] = code
+                reached.append(candidates)
+        frontier = np.concatenate(reached) if reached else np.empty(0, dtype=np.int64)
+
+    shape = (rows + 2, width)
+    return (distance.reshape(shape)[1:-1, 1:-1].copy(),
+            direction.reshape(shape)[1:-1, 1:-1].copy())
+
+
+def extract_path(distance, direction, target):
+    """
+    Follows the parent directions of a distance field back from the `target`
+    (x, y) cell. Returns the list of cells from the source to `target`, or
+    None when `target` is unreachable.
+    """
+    x, y = target
+    if distance[x, y] < 0:
+        return None
+    path = [(x, y)]
+    while direction[x, y] >= 0:
+        dx, dy = DIRECTIONS[direction[x, y]]
+        x, y = x - dx, y - dy
+        path.append((x, y))
+    return path[::-1]
@@ -0,0 +1,77 @@
+import heapq
+
+
+class HeapQueue:
+    """
+    Binary-heap frontier. A push that improves an item's priority leaves the
+    old entry behind; the search skips it when it is popped (lazy deletion).
+    """
+
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item, priority, tie=0):
+        """Adds `item`; among equal priorities the smaller `tie` pops first."""
+        heapq.heappush(self.heap, (priority, tie, item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+
+class BucketQueue:
+    """
+    Dial's bucket queue for small non-negative integer priorities, such as
+    the f- and h-scores of a unit-cost grid.
+
+    Bucket p is an insertion-ordered dict of the items with priority p, and
+    `priority` maps each queued item to its bucket, so pushing an item that is
+    already queued moves it (decrease-key) instead of adding a duplicate.
+    Push is O(1); pop scans forward from the lowest possibly non-empty bucket,
+    which is amortized O(1) when priorities never drop far below the last one
+    popped (A* with a consistent heuristic). Equal priorities pop last in,
+    first out, which favors the cells found most recently, i.e. the deepest.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.priority = {}
+        self.lowest = 0
+
+    def __len__(self):
+        return len(self.priority)
+
+    def push(self, item, priority, tie=0):
+        """Adds `item` or moves it to `priority`; `tie` is ignored (LIFO)."""
+        old = self.priority.get(item)
+        if old is not None:
+            del self.buckets[old][item]
+        while len(self.buckets) <= priority:
+            self.buckets.append({})
+        self.buckets[priority][item] = None
+        self.priority[item] = priority
+        if priority < self.lowest:
+            self.lowest = priority
+
+    def pop(self):
+        buckets = self.buckets
+        while not buckets[self.lowest]:
+            self.lowest += 1
+        item, _ = buckets[self.lowest].popitem()
+        del self.priority[item]
+        return item
+
+
+FRONTIERS = {
+    "heap": HeapQueue,
+    "bucket": BucketQueue
+}
+
+
+def make_frontier(kind):
+    """Returns an empty frontier of the given kind ("heap" or "bucket")."""
+    if kind not in FRONTIERS:
+        raise ValueError(f"unknown frontier {kind!r}, expected one of {sorted(FRONTIERS)}")
+    return FRONTIERS[kind]()
@@ -1,10 +1,11 @@
+import time
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
+from matplotlib import animation
 from matplotlib.colors import ListedColormap, BoundaryNorm
+from searchEvents import FRONTIER, EXPANDED, PATH, DONE
 
 
-delay = 0.1
-
 # Define colors
 free_cell_color = (0.75,0.75,0.75)
 block_cell_color = 'blue'
@@ -35,38 +36,114 @@ def initialize_plot(maze_numeric, algorithm):
     return fig, ax1, ax2, ax3
 
 
-def update_visualization(pathMap, ax, title):
-    ax.clear()
-    ax.set_xticks([])
-    ax.set_yticks([])
-    ax.imshow(pathMap, cmap=cmap, norm=norm)
-    ax.set_title(title)
-    plt.pause(delay)
+# pathMap value written for each kind of search event
+EVENT_VALUES = {FRONTIER: 70, EXPANDED: 70, PATH: 200}
 
 
-def reconstruct_path(came_from, current, pathMap, ax3, title, start, goal):
+class SearchRenderer:
     """
-    Reconstructs the path from the goal to the start.
-    Ensures the path is shown sequentially, one step at a time.
-    """
-    final_path = [current]
-    while current in came_from and came_from[current] is not None:
-        current = came_from[current]
-        final_path.append(current)
-
-    final_path = final_path[::-1]  # Reverse to get correct order
-
-    for x, y in final_path:
-        pathMap[x, y] = 200  # Reveal path step-by-step in red
+    Draws a stream of search events (see searchEvents.py) with blitting.
 
-        ax3.clear()
-        ax3.set_xticks([])
-        ax3.set_yticks([])
-        ax3.imshow(pathMap, cmap=cmap, norm=norm)
-        ax3.set_title(title)
-        plt.pause(delay)  
-    return final_path
+    Each axes gets one persistent image whose data is swapped with set_data;
+    a frame only restores the saved background and redraws those images
+    instead of clearing the axes and calling imshow again. Event batches are
+    applied as they arrive and a frame is drawn at most every `interval_ms`
+    milliseconds (and after every path batch).
+    """
 
+    def __init__(self, pathMap, ax_search, ax_path, algorithm, interval_ms=30):
+        self.pathMap = pathMap
+        self.algorithm = algorithm.upper()
+        self.interval = interval_ms / 1000
+        self.canvas = ax_search.figure.canvas
+        self.images = []
+        for ax, title in ((ax_search, f"{self.algorithm} Search Progress"),
+                          (ax_path, f"{self.algorithm} Final Path")):
+            ax.clear()
+            ax.set_xticks([])
+            ax.set_yticks([])
+            ax.set_title(title)
+            self.images.append(ax.imshow(pathMap, cmap=cmap, norm=norm, animated=True))
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        plt.show(block=False)
+        plt.pause(0.001)
+
+    def _on_draw(self, event):
+        # Full redraws (first show, resizes) skip the animated images, which
+        # leaves exactly the background to restore before every frame
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_images()
+
+    def _draw_images(self):
+        for image in self.images:
+            image.axes.draw_artist(image)
+
+    def draw(self):
+        if self.background is None:
+            self.canvas.draw()
+        for image in self.images:
+            image.set_data(self.pathMap)
+        self.canvas.restore_region(self.background)
+        self._draw_images()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+    def apply(self, kind, cells):
+        self.pathMap[cells[:, 0], cells[:, 1]] = EVENT_VALUES[kind]
+
+    def play(self, events):
+        """Renders `events` as they arrive and returns the search result."""
+        last_draw = time.perf_counter()
+        for kind, data in events:
+            if kind == DONE:
+                self.draw()
+                return data
+            self.apply(kind, data)
+            if kind == PATH or time.perf_counter() - last_draw >= self.interval:
+                self.draw()
+                last_draw = time.perf_counter()
+
+
+def export_animation(events, pathMap, filename, algorithm, batches_per_frame=4, fps=30):
+    """
+    Writes the search behind `events` to a video or GIF file (the writer is
+    picked from the extension: Pillow for .gif, ffmpeg otherwise) without
+    opening a window. Every frame advances the stream by `batches_per_frame`
+    event batches. Returns the search result.
+    """
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_title(f"{algorithm.upper()} Search")
+    image = ax.imshow(pathMap, cmap=cmap, norm=norm, animated=True)
+    result = []
+
+    def frames():
+        batches = 0
+        for kind, data in events:
+            if kind == DONE:
+                result.append(data)
+                break
+            pathMap[data[:, 0], data[:, 1]] = EVENT_VALUES[kind]
+            batches += 1
+            if batches % batches_per_frame == 0:
+                yield None
+        yield None
+
+    def update(_):
+        image.set_data(pathMap)
+        return image,
+
+    movie = animation.FuncAnimation(fig, update, frames=frames, blit=True,
+                                    cache_frame_data=False, save_count=None)
+    if filename.lower().endswith(".gif"):
+        writer = animation.PillowWriter(fps=fps)
+    else:
+        writer = animation.FFMpegWriter(fps=fps)
+    movie.save(filename, writer=writer)
+    plt.close(fig)
+    return result[0] if result else None
 
 
 def display_final_result(algorithm, result, expanded, elapsed):
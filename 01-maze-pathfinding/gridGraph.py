@@ -0,0 +1,107 @@
+import hashlib
+import numpy as np
+
+# Neighbor order used by every search: up, down, right, left
+DIRECTIONS = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+
+
+class GridGraph:
+    """
+    Compact 4-connected graph over the free cells of a maze.
+
+    Cells are identified by flat integer ids (`x * cols + y`). The adjacency
+    is stored CSR-style: the neighbors of cell `v` are
+    `indices[indptr[v]:indptr[v + 1]]`, so the whole graph costs a few bytes
+    per cell instead of a dict entry and a list per cell.
+
+    `costs` optionally gives the cost (1-255) of entering each free cell, as
+    laid by MazeGenerator.assign_terrain. Only the weighted searches
+    (dijkstra, weighted_a_star) read it; the others count steps.
+    """
+
+    def __init__(self, maze, costs=None):
+        maze = np.asarray(maze) != 0
+        self.rows, self.cols = maze.shape
+        self.n = self.rows * self.cols
+        self.maze = maze
+        # One byte per cell, cheap to index from Python loops
+        self.free = maze.tobytes()
+        self.weighted = costs is not None
+        if costs is None:
+            costs = maze.astype(np.uint8)
+        else:
+            costs = np.asarray(costs)
+            if costs.shape != maze.shape:
+                raise ValueError(f"costs shape {costs.shape} does not match maze shape {maze.shape}")
+            if costs[maze].min(initial=255) < 1 or costs.max(initial=0) > 255:
+                raise ValueError("cell costs must be between 1 and 255")
+            costs = np.where(maze, costs, 0).astype(np.uint8)
+        self.costs = costs
+        self.weights = costs.tobytes()
+        self.min_cost = int(costs[maze].min(initial=255))
+        # Structures derived from this maze (junction graph, landmarks, ...)
+        self.cache = {}
+
+        ids = np.arange(self.n, dtype=np.int32).reshape(maze.shape)
+        has_neighbor = []
+        for dx, dy in DIRECTIONS:
+            mask = np.zeros_like(maze)
+            src = maze[max(-dx, 0):self.rows - max(dx, 0), max(-dy, 0):self.cols - max(dy, 0)]
+            dst = maze[max(dx, 0):self.rows - max(-dx, 0), max(dy, 0):self.cols - max(-dy, 0)]
+            mask[max(-dx, 0):self.rows - max(dx, 0), max(-dy, 0):self.cols - max(dy, 0)] = src & dst
+            has_neighbor.append(mask.ravel())
+
+        degree = np.zeros(self.n, dtype=np.int32)
+        for mask in has_neighbor:
+            degree += mask
+        self.indptr = np.zeros(self.n + 1, dtype=np.int32)
+        np.cumsum(degree, out=self.indptr[1:])
+        self.indices = np.empty(int(self.indptr[-1]), dtype=np.int32)
+
+        # Fill one direction at a time so neighbors keep the DIRECTIONS order
+        position = self.indptr[:-1].copy()
+        flat_ids = ids.ravel()
+        for (dx, dy), mask in zip(DIRECTIONS, has_neighbor):
+            offset = dx * self.cols + dy
+            self.indices[position[mask]] = flat_ids[mask] + offset
+            position[mask] += 1
+
+    def fingerprint(self):
+        """
+        Returns a hex digest of the maze layout, identical for equal mazes.
+        """
+        if "fingerprint" not in self.cache:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.array(self.maze.shape, dtype=np.int64).tobytes())
+            # Rows packed like mazeStorage files, so both give the same digest
+            digest.update(np.packbits(self.maze, axis=1).tobytes())
+            if self.weighted:
+                digest.update(self.weights)
+            self.cache["fingerprint"] = digest.hexdigest()
+        return self.cache["fingerprint"]
+
+    def index(self, cell):
+        """Returns the flat id of an `(x, y)` cell."""
+        return cell[0] * self.cols + cell[1]
+
+    def cell(self, v):
+        """Returns the `(x, y)` cell of a flat id."""
+        return divmod(v, self.cols)
+
+    def neighbors(self, v):
+        """Returns the flat ids of the free cells adjacent to `v`."""
+        return self.indices[self.indptr[v]:self.indptr[v + 1]].tolist()
+
+    def path_cost(self, path):
+        """Returns the cost of walking the `(x, y)` cells of `path` from its first cell."""
+        return sum(self.weights[self.index(cell)] for cell in path[1:])
+
+    def __getitem__(self, cell):
+        return [self.cell(u) for u in self.neighbors(self.index(cell))]
+
+    def __iter__(self):
+        for v in np.flatnonzero(self.maze.ravel()).tolist():
+            yield self.cell(v)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.maze))
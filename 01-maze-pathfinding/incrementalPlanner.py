@@ -0,0 +1,157 @@
+import heapq
+import time
+import numpy as np
+from gridGraph import DIRECTIONS
+
+# g/rhs value of a cell with no known path from the start
+UNREACHED = float('inf')
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* between a fixed start and goal on a maze whose
+    cells can be opened and closed between queries.
+
+    Every cell keeps its g-value and a one-step lookahead rhs-value between
+    calls. Opening or closing a cell only makes that cell and its neighbors
+    inconsistent, and plan() repairs just the part of the search those
+    changes affect instead of starting over.
+    """
+
+    def __init__(self, maze, start, goal):
+        maze = np.asarray(maze) != 0
+        self.rows, self.cols = maze.shape
+        self.n = self.rows * self.cols
+        self.free = bytearray(maze.tobytes())
+        self.offsets = [dx * self.cols + dy for dx, dy in DIRECTIONS]
+        self.start = start[0] * self.cols + start[1]
+        self.goal = goal[0] * self.cols + goal[1]
+        self.goal_x, self.goal_y = goal
+        # Plain lists: these are read a dozen times per expansion, and list
+        # indexing is much cheaper than NumPy scalar access
+        self.g = [UNREACHED] * self.n
+        self.rhs = [UNREACHED] * self.n
+        # Current key of every cell on the open list; heap entries whose key
+        # no longer matches are stale and skipped
+        self.open_keys = {}
+        self.open_set = []
+        if self.free[self.start]:
+            self.rhs[self.start] = 0
+            self._push(self.start)
+
+    @property
+    def maze(self):
+        return np.frombuffer(bytes(self.free), dtype=bool).reshape(self.rows, self.cols)
+
+    def _neighbors(self, v):
+        """Free cells adjacent to `v` (whether or not `v` itself is free)."""
+        free = self.free
+        x, y = divmod(v, self.cols)
+        up, down, right, left = self.offsets
+        result = []
+        if x > 0 and free[v + up]:
+            result.append(v + up)
+        if x < self.rows - 1 and free[v + down]:
+            result.append(v + down)
+        if y < self.cols - 1 and free[v + right]:
+            result.append(v + right)
+        if y > 0 and free[v + left]:
+            result.append(v + left)
+        return result
+
+    def _key(self, v):
+        best = min(self.g[v], self.rhs[v])
+        if best == UNREACHED:
+            return (UNREACHED, UNREACHED)
+        x, y = divmod(v, self.cols)
+        return (best + abs(x - self.goal_x) + abs(y - self.goal_y), best)
+
+    def _push(self, v):
+        key = self._key(v)
+        self.open_keys[v] = key
+        heapq.heappush(self.open_set, (key, v))
+
+    def _update(self, v):
+        """Recomputes rhs(v) and puts `v` on the open list iff it is inconsistent."""
+        if v != self.start:
+            best = UNREACHED
+            if self.free[v]:
+                for neighbor in self._neighbors(v):
+                    if self.g[neighbor] < best:
+                        best = self.g[neighbor]
+                if best != UNREACHED:
+                    best += 1
+            self.rhs[v] = best
+        if self.g[v] != self.rhs[v]:
+            self._push(v)
+        else:
+            self.open_keys.pop(v, None)
+
+    def _top(self):
+        """Returns the smallest valid (key, cell) on the open list, dropping stale entries."""
+        while self.open_set:
+            key, v = self.open_set[0]
+            if self.open_keys.get(v) == key:
+                return key, v
+            heapq.heappop(self.open_set)
+        return (UNREACHED, UNREACHED), None
+
+    def set_cell(self, cell, free):
+        """Opens (free=True) or closes (free=False) the (x, y) cell."""
+        v = cell[0] * self.cols + cell[1]
+        if bool(self.free[v]) == bool(free):
+            return
+        self.free[v] = 1 if free else 0
+        if v == self.start:
+            self.rhs[v] = 0 if free else UNREACHED
+        self._update(v)
+        for neighbor in self._neighbors(v):
+            self._update(neighbor)
+
+    def toggle(self, cell):
+        """Flips the (x, y) cell between wall and free."""
+        self.set_cell(cell, not self.free[cell[0] * self.cols + cell[1]])
+
+    def plan(self):
+        """
+        Repairs the search after the changes made since the last call.
+        Returns (path_length, expanded_nodes, elapsed) for this call only.
+        """
+        start_time = time.time()
+        goal = self.goal
+        expanded_nodes = 0
+        while True:
+            key, v = self._top()
+            if v is None or (key >= self._key(goal) and self.rhs[goal] == self.g[goal]):
+                break
+            heapq.heappop(self.open_set)
+            del self.open_keys[v]
+            expanded_nodes += 1
+            if self.g[v] > self.rhs[v]:
+                self.g[v] = self.rhs[v]  # Overconsistent: settle it
+                for neighbor in self._neighbors(v):
+                    self._update(neighbor)
+            else:
+                self.g[v] = UNREACHED  # Underconsistent: reopen it and its neighbors
+                self._update(v)
+                for neighbor in self._neighbors(v):
+                    self._update(neighbor)
+
+        elapsed_time = time.time() - start_time
+        if self.g[goal] == UNREACHED:
+            return None, expanded_nodes, elapsed_time
+        return self.g[goal] + 1, expanded_nodes, elapsed_time
+
+    def path(self):
+        """
+        Returns the current shortest path as a list of (x, y) cells, or None
+        if the goal is unreachable. Call plan() first.
+        """
+        if self.g[self.goal] == UNREACHED:
+            return None
+        current = self.goal
+        path = [current]
+        while current != self.start:
+            current = min(self._neighbors(current), key=lambda v: self.g[v])
+            path.append(current)
+        return [divmod(v, self.cols) for v in reversed(path)]
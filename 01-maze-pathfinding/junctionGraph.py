@@ -0,0 +1,186 @@
+import heapq
+import time
+import numpy as np
+
+# Virtual nodes standing for the query's start and goal cells
+START = -2
+GOAL = -1
+
+
+class JunctionGraph:
+    """
+    Weighted graph over the junctions and dead ends of a maze.
+
+    Every free cell with exactly two free neighbors lies on a corridor, so a
+    search never has to stop there. The corridors are collapsed into weighted
+    edges between the remaining cells (the nodes) once per maze, and a query
+    only walks the corridors holding its start and goal cells. The full cell
+    path is rebuilt by re-walking the chosen corridors at the end.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        free = graph.maze.ravel()
+        self.degree = np.diff(graph.indptr)
+        self.is_node = free & (self.degree != 2)
+        self.nodes = np.flatnonzero(self.is_node)
+        self.dead_end = (self.degree == 1).tobytes()
+
+        # node -> [(other node, corridor length, first cell of the corridor)]
+        self.edges = {}
+        for node in self.nodes.tolist():
+            self.edges[node] = [self._walk(node, first) for first in graph.neighbors(node)]
+
+    @classmethod
+    def of(cls, graph):
+        """Returns the junction graph of `graph`, building it on first use."""
+        if "junctions" not in graph.cache:
+            graph.cache["junctions"] = cls(graph)
+        return graph.cache["junctions"]
+
+    def _walk(self, previous, current, stop=None, cells=None):
+        """
+        Follows the corridor entered by stepping from `previous` to `current`
+        until it reaches a node, `stop`, or loops back to where it began.
+        Returns (end cell, steps taken, first cell); visited cells are
+        appended to `cells` when given.
+        """
+        first, origin, steps = current, previous, 1
+        is_node, neighbors = self.is_node, self.graph.neighbors
+        while not is_node[current] and current != stop and current != origin:
+            if cells is not None:
+                cells.append(current)
+            a, b = neighbors(current)
+            previous, current = current, (b if a == previous else a)
+            steps += 1
+        return current, steps, first
+
+    def _attach(self, cell, other):
+        """
+        Returns the (node, distance, first cell) entry points of `cell`. A node
+        is its own entry point; a corridor cell reaches the nodes at both ends
+        of its corridor, or `other` directly when it lies on the same corridor.
+        """
+        if self.is_node[cell]:
+            return [(cell, 0, None)]
+        ends = []
+        for first in self.graph.neighbors(cell):
+            end = self._walk(cell, first, stop=other)
+            if end[0] != cell:  # A corridor looping back on itself leads nowhere
+                ends.append(end)
+        return ends
+
+    def _corridor(self, previous, first, stop):
+        """
+        Returns the cells from `first` up to and including the end of its
+        corridor (or `stop`).
+        """
+        cells = []
+        end, _, _ = self._walk(previous, first, stop=stop, cells=cells)
+        cells.append(end)
+        return cells
+
+    def search(self, start, goal, observer=None):
+        """
+        A* with the Manhattan heuristic on the junction graph from `start` to
+        `goal` (both (x, y) cells). Returns (path_length, expanded_nodes,
+        elapsed) like the solvers in algorithm.py, counting expanded junctions.
+        """
+        start_time = time.time()
+        graph, cols = self.graph, self.graph.cols
+        start, goal = graph.index(start), graph.index(goal)
+        goal_x, goal_y = divmod(goal, cols)
+
+        def h_score(v):
+            x, y = divmod(v, cols)
+            return abs(x - goal_x) + abs(y - goal_y)
+
+        # Distance and first corridor cell from each goal entry point to the goal
+        goal_entries = {}
+        if start != goal:
+            for node, distance, first in self._attach(goal, start):
+                if node not in goal_entries or distance < goal_entries[node][0]:
+                    goal_entries[node] = (distance, first)
+
+        g_score = {}
+        parent = {}  # node -> (previous node, first corridor cell)
+        open_set = []
+        if start == goal:
+            g_score[GOAL], parent[GOAL] = 0, (START, None)
+            heapq.heappush(open_set, (0, 0, GOAL))
+        for node, distance, first in self._attach(start, goal):
+            if node == goal:
+                # Start and goal share a corridor
+                if distance < g_score.get(GOAL, np.inf):
+                    g_score[GOAL], parent[GOAL] = distance, (START, first)
+                    heapq.heappush(open_set, (distance, 0, GOAL))
+            elif distance < g_score.get(node, np.inf):
+                g_score[node], parent[node] = distance, (START, first)
+                heapq.heappush(open_set, (distance + h_score(node), h_score(node), node))
+
+        closed = set()
+        dead_end = self.dead_end
+        expanded_nodes = 0
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue  # Stale entry left behind by a cheaper push
+            closed.add(current)
+            expanded_nodes += 1
+            if current == GOAL:
+                path = self._expand(start, goal, parent)
+                if observer is not None:
+                    observer.show_path([graph.cell(v) for v in path])
+                return len(path), expanded_nodes, time.time() - start_time
+
+            if observer is not None:
+                observer.expand(graph.cell(current))
+            candidates = self.edges[current]
+            if current in goal_entries:
+                distance, first = goal_entries[current]
+                candidates = candidates + [(GOAL, distance, first)]
+            for neighbor, weight, first in candidates:
+                if neighbor != GOAL and dead_end[neighbor] and neighbor not in goal_entries:
+                    continue  # Nothing lies beyond a dead end
+                tentative_g_score = g_score[current] + weight
+                if tentative_g_score < g_score.get(neighbor, np.inf):
+                    g_score[neighbor] = tentative_g_score
+                    parent[neighbor] = (current, first)
+                    h = 0 if neighbor == GOAL else h_score(neighbor)
+                    heapq.heappush(open_set, (tentative_g_score + h, h, neighbor))
+                    if observer is not None and neighbor != GOAL:
+                        observer.visit(graph.cell(neighbor))  # Mark as searching
+
+        if observer is not None:
+            observer.show_path(None)
+        return None, expanded_nodes, time.time() - start_time
+
+    def _expand(self, start, goal, parent):
+        """Rebuilds the cell path from the parent links of the virtual goal."""
+        legs = []
+        node = GOAL
+        while node != START:
+            previous, first = parent[node]
+            legs.append((previous, first, node))
+            node = previous
+        path = [start]
+        for previous, first, node in reversed(legs):
+            if first is None:
+                continue
+            if previous == START:
+                path.extend(self._corridor(start, first, goal))
+            elif node == GOAL:
+                # Goal entries were walked from the goal towards the node
+                cells = self._corridor(goal, first, previous)
+                path.extend(cells[-2::-1])
+                path.append(goal)
+            else:
+                path.extend(self._corridor(previous, first, goal))
+        return path
+
+
+def junction_a_star(graph, start, goal, observer=None):
+    """
+    A* on the cached junction graph of `graph`; see JunctionGraph.search.
+    """
+    return JunctionGraph.of(graph).search(start, goal, observer)
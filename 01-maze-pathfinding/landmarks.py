@@ -0,0 +1,112 @@
+import os
+import numpy as np
+from algorithm import A_star
+from distanceField import distance_field
+
+
+def bfs_distances(graph, source):
+    """
+    Returns the BFS distance from the flat cell id `source` to every cell
+    of `graph` as an int32 array, with -1 for unreachable cells.
+    """
+    distance, _ = distance_field(graph.maze, graph.cell(source))
+    return distance.ravel()
+
+
+class Landmarks:
+    """
+    Landmark (ALT) lower bounds for A* on one maze.
+
+    For a landmark L the triangle inequality gives
+    d(v, goal) >= |d(L, goal) - d(L, v)|, so the largest such difference over
+    all landmarks is an admissible, consistent heuristic. The landmarks are
+    spread out by farthest-point selection and cost one BFS each; the tables
+    are cached per maze and can be saved next to it with save()/load().
+    """
+
+    def __init__(self, graph, k=8, seed=None):
+        self.graph = graph
+        rng = np.random.default_rng(seed)
+        free = np.flatnonzero(graph.maze.ravel())
+        self.landmarks = []
+        distances = []
+        # Distance from each cell to its closest landmark so far
+        closest = None
+        candidate = int(rng.choice(free))
+        for _ in range(min(k, len(free))):
+            self.landmarks.append(candidate)
+            distance = bfs_distances(graph, candidate)
+            distances.append(distance)
+            reachable = np.where(distance >= 0, distance, np.iinfo(np.int32).max)
+            closest = reachable if closest is None else np.minimum(closest, reachable)
+            # The next landmark is the reachable cell farthest from all others
+            closest_free = np.where(graph.maze.ravel() & (closest < np.iinfo(np.int32).max), closest, -1)
+            candidate = int(np.argmax(closest_free))
+            if closest_free[candidate] <= 0:
+                break
+        # One row of k distances per cell keeps a lookup contiguous
+        self.table = np.ascontiguousarray(np.stack(distances, axis=1), dtype=np.int32)
+        self.fingerprint = graph.fingerprint()
+
+    @classmethod
+    def of(cls, graph, k=8, path=None):
+        """
+        Returns the landmarks of `graph`, reusing the cached tables, then the
+        ones stored at `path` (if it exists and matches this maze), and only
+        then running the precomputation (saving it to `path` if given). The
+        first landmark is drawn with a seed taken from the maze fingerprint,
+        so the same maze always gets the same landmarks.
+        """
+        key = ("landmarks", k)
+        if key not in graph.cache:
+            landmarks = None
+            if path is not None and os.path.exists(path):
+                try:
+                    landmarks = cls.load(path, graph)
+                except ValueError:
+                    landmarks = None
+            if landmarks is None:
+                landmarks = cls(graph, k, seed=int(graph.fingerprint(), 16))
+                if path is not None:
+                    landmarks.save(path)
+            graph.cache[key] = landmarks
+        return graph.cache[key]
+
+    def save(self, path):
+        np.savez_compressed(path, landmarks=np.array(self.landmarks, dtype=np.int64),
+                            table=self.table, fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, path, graph):
+        """
+        Loads landmark tables saved by save(). Raises ValueError if they were
+        computed for a different maze.
+        """
+        with np.load(path) as data:
+            if str(data["fingerprint"]) != graph.fingerprint():
+                raise ValueError(f"{path} holds landmarks of a different maze")
+            landmarks = cls.__new__(cls)
+            landmarks.graph = graph
+            landmarks.landmarks = data["landmarks"].tolist()
+            landmarks.table = np.ascontiguousarray(data["table"], dtype=np.int32)
+            landmarks.fingerprint = graph.fingerprint()
+        return landmarks
+
+    def heuristic(self, v, goal):
+        """
+        Lower bound on the distance between flat cell ids `v` and `goal`:
+        the best landmark bound or the Manhattan distance, whichever is larger.
+        Unreachable cells hold -1, which can only skew the bound for cells
+        that cannot reach `goal` anyway.
+        """
+        bound = int(np.abs(self.table[v] - self.table[goal]).max())
+        x, y = divmod(v, self.graph.cols)
+        goal_x, goal_y = divmod(goal, self.graph.cols)
+        return max(bound, abs(x - goal_x) + abs(y - goal_y))
+
+
+def alt_a_star(graph, start, goal, observer=None, k=8, path=None):
+    """
+    A* guided by the cached landmark heuristic of `graph`; see Landmarks.of.
+    """
+    return A_star(graph, start, goal, observer, h=Landmarks.of(graph, k, path).heuristic)
@@ -1,48 +1,108 @@
+from functools import partial
 import numpy as np
-from collections import defaultdict
 from mazeGenerator import PrimsMaze
-from algorithm import A_star, bfs, dfs, greedy, iterative_deepening_search
-from graphics import initialize_plot, display_final_result
-
-def mat2graph(mat):
-    rows, cols = mat.shape
-    graph = defaultdict(list)
-    for x in range(rows):
-        for y in range(cols):
-            if mat[x, y] != 0:
-                for dx, dy in [(-1, 0), (1, 0), (0, 1), (0, -1)]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < rows and 0 <= ny < cols and mat[nx, ny] != 0:
-                        graph[(x, y)].append((nx, ny))
-    return graph
+from gridGraph import GridGraph
+from junctionGraph import junction_a_star
+from landmarks import alt_a_star
+from algorithm import (A_star, bfs, dfs, greedy, iterative_deepening_search,
+                       bidirectional_A_star, bidirectional_bfs, jump_point_search,
+                       dijkstra, weighted_a_star, ida_star)
+from graphics import initialize_plot, display_final_result, SearchRenderer, export_animation
+from pathCache import PathCache, PathRecorder
+from searchEvents import search_events
+
+# Cells per search event batch, and the minimum time between two frames
+VISUALIZE_BATCH = 256
+VISUALIZE_INTERVAL_MS = 30
+
+# Set to a file name (e.g. "search.gif" or "search.mp4") to write the search
+# to an animation instead of showing it live
+EXPORT_ANIMATION = None
+
+# Set to an int to regenerate the same maze on every run
+MAZE_SEED = None
+
+# Lay mud and water (see mazeGenerator.TERRAIN_LAYERS) over the maze; only
+# Dijkstra and Weighted-A* take the cell costs into account
+TERRAIN = False
+
+# Results of repeated (maze, start, goal, algorithm) queries
+PATH_CACHE = PathCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+
+# Search functions selectable by name; all share the
+# (graph, start, goal, observer) -> (path_length, expanded, elapsed) contract
+ALGORITHMS = {
+    "a*": A_star,
+    "a*-bucket": partial(A_star, frontier="bucket"),
+    "bfs": bfs,
+    "dfs": dfs,
+    "greedy": greedy,
+    "greedy-bucket": partial(greedy, frontier="bucket"),
+    "ids": iterative_deepening_search,
+    "ida*": ida_star,
+    "bi-a*": bidirectional_A_star,
+    "bi-bfs": bidirectional_bfs,
+    "jps": jump_point_search,
+    "junction-a*": junction_a_star,
+    "alt-a*": alt_a_star,
+    "dijkstra": dijkstra,
+    "weighted-a*": weighted_a_star
+}
+
+
+def mat2graph(mat, costs=None):
+    """
+    Builds the array-backed grid graph of a maze; non-zero cells are free.
+    `costs` optionally gives the cost of entering each cell.
+    """
+    return GridGraph(mat, costs)
+
+
+def solve(algorithm, graph, start, goal, observer=None, cache=PATH_CACHE):
+    """
+    Runs ALGORITHMS[algorithm] through `cache`, so a query already solved
+    on an identical maze is answered without searching again.
+    """
+    if cache is None:
+        return ALGORITHMS[algorithm](graph, start, goal, observer)
+    return cache.solve(algorithm, ALGORITHMS[algorithm], graph, start, goal, observer)
 
 
 if __name__ == "__main__":
     size = int(input("Enter size of maze/graph: "))
-    algorithm = input("Choose an algorithm (A*, BFS, DFS, Greedy, IDS): ").strip().lower()
+    algorithm = input("Choose an algorithm (A*, A*-Bucket, BFS, DFS, Greedy, Greedy-Bucket, IDS, IDA*, Bi-A*, Bi-BFS, JPS, Junction-A*, ALT-A*, Dijkstra, Weighted-A*): ").strip().lower()
+    visualize = input("Visualize the search? (y/n): ").strip().lower() != "n"
 
     print("Generating random maze...")
-    obj = PrimsMaze(size, show_maze=True)
+    obj = PrimsMaze(size, show_maze=visualize, seed=MAZE_SEED)
     maze_bool = obj.create_maze((0, 0))
     maze_numeric = np.where(maze_bool, 1, 0).astype(np.uint8)
 
-    fig, ax1, ax2, ax3 = initialize_plot(maze_numeric, algorithm)
-    
-    graph = mat2graph(maze_numeric)
+    graph = mat2graph(maze_numeric, obj.assign_terrain() if TERRAIN else None)
     start = (0, 0)
     destination = (maze_numeric.shape[0] - 1, maze_numeric.shape[1] - 1)
-    pathMap = maze_numeric.copy()
-
-    algorithms = {
-        "a*": A_star,
-        "bfs": bfs,
-        "dfs": dfs,
-        "greedy": greedy,
-        "ids": iterative_deepening_search
-    }
-
-    if algorithm in algorithms:
-        result, expanded, elapsed = algorithms[algorithm](graph, start, destination, pathMap, ax2, ax3)
-        display_final_result(algorithm, result, expanded, elapsed)
+
+    if algorithm in ALGORITHMS:
+        if visualize:
+            events = search_events(lambda *query: solve(algorithm, *query),
+                                   graph, start, destination, batch_size=VISUALIZE_BATCH)
+            pathMap = maze_numeric.copy()
+            if EXPORT_ANIMATION:
+                result, expanded, elapsed = export_animation(events, pathMap, EXPORT_ANIMATION, algorithm)
+                print(f"Animation written to {EXPORT_ANIMATION}")
+            else:
+                fig, ax1, ax2, ax3 = initialize_plot(maze_numeric, algorithm)
+                renderer = SearchRenderer(pathMap, ax2, ax3, algorithm, interval_ms=VISUALIZE_INTERVAL_MS)
+                result, expanded, elapsed = renderer.play(events)
+                display_final_result(algorithm, result, expanded, elapsed)
+        else:
+            recorder = PathRecorder()
+            result, expanded, elapsed = solve(algorithm, graph, start, destination, recorder)
+            cost = None if recorder.path is None else graph.path_cost(recorder.path)
+            print(f"Algorithm: {algorithm.upper()}\n"
+                  f"Path Length: {result}\n"
+                  f"Path Cost: {cost}\n"
+                  f"Expanded Nodes: {expanded}\n"
+                  f"Time: {elapsed:.4f} seconds")
     else:
         print("Invalid algorithm selection!")
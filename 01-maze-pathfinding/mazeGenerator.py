@@ -1,3 +1,4 @@
+import random
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
@@ -7,82 +8,202 @@ colors = ["blue", (0.75,0.75,0.75)]
 cmap = mcolors.ListedColormap(colors)
 delay = 0.005
 
-class PrimsMaze:
-    def __init__(self, size=25, show_maze=True):
+# Values stored in MazeGenerator.grid
+WALL = -50
+UNVISITED = -1
+PASSAGE = 1
+
+# Cost of entering a free cell of each terrain type
+ROAD = 1
+MUD = 3
+WATER = 8
+
+# (cost, fraction of the free cells) of the layers laid by assign_terrain
+TERRAIN_LAYERS = [(MUD, 0.25), (WATER, 0.10)]
+
+
+def terrain_costs(maze, seed=None, layers=TERRAIN_LAYERS, smoothing=4):
+    """
+    Returns a uint8 array of per-cell traversal costs for a boolean maze:
+    0 on walls, ROAD on free cells except for the patches covered by
+    `layers`, a list of (cost, fraction) pairs laid in order. Each layer
+    thresholds a box-blurred noise field, so it forms blobs rather than
+    scattered cells.
+    """
+    maze = np.asarray(maze) != 0
+    rng = np.random.default_rng(seed)
+    costs = np.where(maze, ROAD, 0).astype(np.uint8)
+    for cost, fraction in layers:
+        noise = rng.random(maze.shape)
+        for _ in range(smoothing):
+            padded = np.pad(noise, 1, mode="edge")
+            noise = (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] +
+                     padded[1:-1, 2:] + padded[1:-1, 1:-1]) / 5
+        patch = maze & (noise >= np.quantile(noise, 1 - fraction))
+        costs[patch] = cost
+    return costs
+
+
+class MazeGenerator:
+    """
+    Common state of the maze generators.
+
+    The maze is a `size` x `size` grid (size is forced to be odd) whose cells
+    sit on even coordinates and whose walls sit between them. `grid` holds
+    WALL / UNVISITED / PASSAGE values while carving; `maze` is the final
+    boolean maze where True marks a free cell. Passing the same `seed` always
+    produces the same maze.
+    """
+
+    def __init__(self, size=25, show_maze=True, seed=None):
         self.size = (size // 2) * 2 + 1
         self.show_maze = show_maze
-        self.walls_list = []
-        self.grid = np.full((self.size, self.size), -50, dtype=int)
-        for i in range(self.size // 2 + 1):
-            for j in range(self.size // 2 + 1):
-                self.grid[i * 2, j * 2] = -1
+        self.seed = seed
+        self.grid = np.full((self.size, self.size), WALL, dtype=np.int8)
+        self.grid[::2, ::2] = UNVISITED
         self.maze = np.zeros((self.size, self.size), dtype=bool)
-        
 
     def is_valid(self, curr, dx, dy):
         x, y = curr
         return 0 <= x + dx < self.size and 0 <= y + dy < self.size
 
+    def draw(self):
+        plt.figure(1)
+        plt.clf()
+        plt.imshow(self.grid, cmap, interpolation='nearest')
+        plt.title('Generating Maze ...')
+        plt.pause(delay)
+
+    def assign_terrain(self, layers=TERRAIN_LAYERS, smoothing=4):
+        """Lays terrain over the finished maze with its seed; see terrain_costs."""
+        self.costs = terrain_costs(self.maze, self.seed, layers, smoothing)
+        return self.costs
+
+    def finish(self):
+        self.maze = self.grid == PASSAGE
+
+        print("Random maze has been generated")
+        if self.show_maze:
+            self.draw()
+            plt.pause(2)
+            plt.close()
+
+        return self.maze
+
+
+class PrimsMaze(MazeGenerator):
+    """
+    Randomized Prim's algorithm over a frontier of walls.
+
+    The frontier is a plain list of flat wall ids. A random wall is removed
+    by swapping it with the last entry and popping, which is O(1), and each
+    wall enters the frontier at most once.
+    """
+
+    def __init__(self, size=25, show_maze=True, seed=None):
+        super().__init__(size, show_maze, seed)
+        self.rng = random.Random(seed)
+        self.walls_list = []
+        self.in_frontier = bytearray(self.size * self.size)
+
     def add_neighbors(self, curr):
-        nearby = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-        for dx, dy in nearby:
+        x, y = curr
+        for dx, dy in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
             if self.is_valid(curr, dx, dy):
-                self.walls_list.append((curr[0] + dx, curr[1] + dy))
+                wall = (x + dx) * self.size + y + dy
+                if not self.in_frontier[wall]:
+                    self.in_frontier[wall] = 1
+                    self.walls_list.append(wall)
 
     def create_maze(self, start):
         start = ((start[0] // 2) * 2, (start[1] // 2) * 2)
-        self.grid[start[0], start[1]] = 1
+        size = self.size
+        # Flat, writable view of grid that is cheap to index from Python
+        grid = memoryview(self.grid.reshape(-1))
+        walls = self.walls_list
+        randrange = self.rng.randrange
+
+        grid[start[0] * size + start[1]] = PASSAGE
         self.add_neighbors(start)
-        
-        
-        while len(self.walls_list):
-            ind = np.random.randint(0, len(self.walls_list))
-            wall_x, wall_y = self.walls_list[ind]
-            
-            if self.is_valid((wall_x, wall_y), -1, 0) and self.is_valid((wall_x, wall_y), 1, 0):
-                top = (wall_x - 1, wall_y)
-                bottom = (wall_x + 1, wall_y)
-                if self.grid[top] == 1 and self.grid[bottom] == -1:
-                    self.grid[wall_x, wall_y] = 1
-                    self.grid[bottom] = 1
-                    self.add_neighbors(bottom)
-                elif self.grid[top] == -1 and self.grid[bottom] == 1:
-                    self.grid[wall_x, wall_y] = 1
-                    self.grid[top] = 1
-                    self.add_neighbors(top)
-                self.walls_list.remove((wall_x, wall_y))
-            
-            if self.is_valid((wall_x, wall_y), 0, 1) and self.is_valid((wall_x, wall_y), 0, -1):
-                left = (wall_x, wall_y - 1)
-                right = (wall_x, wall_y + 1)
-                if self.grid[left] == 1 and self.grid[right] == -1:
-                    self.grid[wall_x, wall_y] = 1
-                    self.grid[right] = 1
-                    self.add_neighbors(right)
-                elif self.grid[left] == -1 and self.grid[right] == 1:
-                    self.grid[wall_x, wall_y] = 1
-                    self.grid[left] = 1
-                    self.add_neighbors(left)
-                self.walls_list.remove((wall_x, wall_y))
-            
+
+        while walls:
+            ind = randrange(len(walls))
+            wall = walls[ind]
+            walls[ind] = walls[-1]
+            walls.pop()
+
+            # Walls on odd rows join the cells above and below them,
+            # walls on odd columns join the cells to the left and right
+            if (wall // size) % 2:
+                first, second = wall - size, wall + size
+            else:
+                first, second = wall - 1, wall + 1
+
+            if grid[first] == PASSAGE and grid[second] == UNVISITED:
+                grid[wall] = PASSAGE
+                grid[second] = PASSAGE
+                self.add_neighbors(divmod(second, size))
+            elif grid[first] == UNVISITED and grid[second] == PASSAGE:
+                grid[wall] = PASSAGE
+                grid[first] = PASSAGE
+                self.add_neighbors(divmod(first, size))
+
             if self.show_maze:
-                plt.figure(1)
-                plt.clf()
-                plt.imshow(self.grid, cmap, interpolation='nearest')
-                plt.title('Generating Maze ...')
-                plt.pause(delay)
-                
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row, col] == 1:
-                    self.maze[row, col] = True
+                self.draw()
 
-        print("Random maze has been generated")
-        if self.show_maze:
-            plt.pause(2)
-            plt.close()
+        return self.finish()
 
-        return self.maze
+
+class KruskalMaze(MazeGenerator):
+    """
+    Randomized Kruskal's algorithm on a union-find over cell indices.
+
+    All walls are listed and shuffled with NumPy up front; a wall is carved
+    whenever the two cells it separates are still in different sets. The
+    carved walls are written back to `grid` in one vectorized assignment.
+    """
+
+    def __init__(self, size=25, show_maze=True, seed=None):
+        super().__init__(size, show_maze, seed)
+        self.rng = np.random.default_rng(seed)
+
+    def create_maze(self, start=(0, 0)):
+        size = self.size
+        cells_per_side = size // 2 + 1
+
+        # Walls between vertically and horizontally adjacent cells
+        wall_x, wall_y = np.mgrid[1:size:2, 0:size:2]
+        vertical = (wall_x * size + wall_y).ravel()
+        wall_x, wall_y = np.mgrid[0:size:2, 1:size:2]
+        horizontal = (wall_x * size + wall_y).ravel()
+        walls = np.concatenate([vertical, horizontal])
+        first = np.concatenate([vertical - size, horizontal - 1])
+        second = np.concatenate([vertical + size, horizontal + 1])
+
+        order = self.rng.permutation(len(walls))
+        walls, first, second = walls[order], first[order], second[order]
+
+        # Flat grid ids of cells -> union-find indices
+        def cell_index(ids):
+            x, y = np.divmod(ids, size)
+            return (x // 2) * cells_per_side + y // 2
+
+        parent = list(range(cells_per_side * cells_per_side))
+        carved = []
+        for wall, a, b in zip(walls.tolist(), cell_index(first).tolist(), cell_index(second).tolist()):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a != b:
+                parent[a] = b
+                carved.append(wall)
+
+        self.grid[::2, ::2] = PASSAGE
+        self.grid.reshape(-1)[np.array(carved, dtype=np.int64)] = PASSAGE
+        return self.finish()
 
 
 if __name__ == "__main__":
@@ -97,4 +218,3 @@ if __name__ == "__main__":
     plt.xticks([]), plt.yticks([])
     plt.title("Final Maze")
     plt.show()
-
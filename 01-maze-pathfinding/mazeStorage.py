@@ -0,0 +1,204 @@
+"""
+Compact on-disk maze format.
+
+A maze file is a 32-byte header followed by the maze packed at 1 bit per
+cell, one run of `row_bytes` bytes per row (most significant bit first):
+
+    magic  b"MAZE"   version  uint16   flags     uint16
+    rows   uint32    cols     uint32   seed      int64 (-1 when unknown)
+    row_bytes uint32 (4 bytes of padding)
+
+PackedMaze maps the file with np.memmap and unpacks it lazily in blocks of
+rows, so a maze far larger than memory can be queried cell by cell.
+PackedGridGraph exposes it to the solvers in algorithm.py.
+"""
+import hashlib
+import struct
+from collections import OrderedDict
+import numpy as np
+from gridGraph import DIRECTIONS
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIqI4x")
+
+
+def save_maze(path, maze, seed=None):
+    """Writes a boolean maze (True = free) to `path` in the packed format."""
+    maze = np.asarray(maze) != 0
+    rows, cols = maze.shape
+    packed = np.packbits(maze, axis=1)
+    with open(path, "wb") as stream:
+        stream.write(HEADER.pack(MAGIC, VERSION, 0, rows, cols,
+                                 -1 if seed is None else seed, packed.shape[1]))
+        stream.write(packed.tobytes())
+
+
+class PackedMaze:
+    """
+    Read-only, memory-mapped view of a packed maze file.
+
+    Rows are unpacked `block_rows` at a time and the `max_blocks` most
+    recently used blocks are kept; each block is stored as bytes (one byte
+    per cell) because those are the cheapest to index from Python.
+    """
+
+    def __init__(self, path, block_rows=256, max_blocks=64):
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a maze file")
+        magic, version, _, rows, cols, seed, row_bytes = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        if version != VERSION:
+            raise ValueError(f"{path} has unsupported maze format version {version}")
+
+        self.path = path
+        self.shape = (rows, cols)
+        self.seed = None if seed == -1 else seed
+        self.row_bytes = row_bytes
+        self.packed = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size,
+                                shape=(rows, row_bytes))
+        self.block_rows = block_rows
+        self.max_blocks = max_blocks
+        self.blocks = OrderedDict()
+
+    def block(self, index):
+        """Returns rows [index * block_rows, (index + 1) * block_rows) as bytes."""
+        if index in self.blocks:
+            self.blocks.move_to_end(index)
+            return self.blocks[index]
+        start = index * self.block_rows
+        packed = self.packed[start:start + self.block_rows]
+        unpacked = np.unpackbits(packed, axis=1, count=self.shape[1]).tobytes()
+        self.blocks[index] = unpacked
+        if len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        return unpacked
+
+    def __getitem__(self, cell):
+        x, y = cell
+        index, row = divmod(x, self.block_rows)
+        return bool(self.block(index)[row * self.shape[1] + y])
+
+    def to_array(self):
+        """Unpacks the whole maze into a boolean array."""
+        return np.unpackbits(self.packed, axis=1, count=self.shape[1]).astype(bool)
+
+    def fingerprint(self):
+        """Same digest as GridGraph.fingerprint() of the unpacked maze."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array(self.shape, dtype=np.int64).tobytes())
+        for start in range(0, self.shape[0], self.block_rows):
+            digest.update(self.packed[start:start + self.block_rows].tobytes())
+        return digest.hexdigest()
+
+
+def load_maze(path, **kwargs):
+    """Opens a packed maze file; see PackedMaze."""
+    return PackedMaze(path, **kwargs)
+
+
+class _PackedFree:
+    """Indexable by flat cell id like GridGraph.free, backed by PackedMaze blocks."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.block_cells = maze.block_rows * maze.shape[1]
+        self.last_index = None
+        self.last_block = None
+
+    def __getitem__(self, v):
+        index, offset = divmod(v, self.block_cells)
+        if index != self.last_index:
+            self.last_block = self.maze.block(index)
+            self.last_index = index
+        return self.last_block[offset]
+
+
+class PackedGridGraph:
+    """
+    GridGraph look-alike that answers neighbor queries straight from a
+    PackedMaze, so the solvers in algorithm.py can run without unpacking the
+    maze. Their per-cell search state (parents, g-scores) is still allocated.
+
+    Packed mazes carry no terrain, so every free cell costs 1 to enter. The
+    solvers that precompute over the whole maze (junction-a*, alt-a* and
+    distance_field) read `maze` and `indptr`, which unpack the whole maze
+    once on first use.
+    """
+
+    def __init__(self, maze):
+        if not isinstance(maze, PackedMaze):
+            maze = PackedMaze(maze)
+        self.packed = maze
+        self.rows, self.cols = maze.shape
+        self.n = self.rows * self.cols
+        self.free = _PackedFree(maze)
+        # Uniform costs: entering a free cell costs 1, a wall 0, like GridGraph.weights
+        self.weighted = False
+        self.weights = self.free
+        self.min_cost = 1
+        self.cache = {}
+        self.offsets = [dx * self.cols + dy for dx, dy in DIRECTIONS]
+
+    @property
+    def maze(self):
+        """The unpacked boolean maze, unpacked on first use."""
+        if "maze" not in self.cache:
+            self.cache["maze"] = self.packed.to_array()
+        return self.cache["maze"]
+
+    @property
+    def indptr(self):
+        """CSR row pointers like GridGraph.indptr (only the degrees are used)."""
+        if "indptr" not in self.cache:
+            maze = self.maze
+            degree = np.zeros(maze.shape, dtype=np.int32)
+            degree[1:, :] += maze[:-1, :]
+            degree[:-1, :] += maze[1:, :]
+            degree[:, 1:] += maze[:, :-1]
+            degree[:, :-1] += maze[:, 1:]
+            indptr = np.zeros(self.n + 1, dtype=np.int32)
+            np.cumsum(np.where(maze, degree, 0).ravel(), out=indptr[1:])
+            self.cache["indptr"] = indptr
+        return self.cache["indptr"]
+
+    def fingerprint(self):
+        if "fingerprint" not in self.cache:
+            self.cache["fingerprint"] = self.packed.fingerprint()
+        return self.cache["fingerprint"]
+
+    def index(self, cell):
+        """Returns the flat id of an `(x, y)` cell."""
+        return cell[0] * self.cols + cell[1]
+
+    def cell(self, v):
+        """Returns the `(x, y)` cell of a flat id."""
+        return divmod(v, self.cols)
+
+    def neighbors(self, v):
+        """Returns the flat ids of the free cells adjacent to `v`."""
+        free, cols = self.free, self.cols
+        if not free[v]:
+            return []
+        x, y = divmod(v, cols)
+        up, down, right, left = self.offsets
+        result = []
+        if x > 0 and free[v + up]:
+            result.append(v + up)
+        if x < self.rows - 1 and free[v + down]:
+            result.append(v + down)
+        if y < cols - 1 and free[v + right]:
+            result.append(v + right)
+        if y > 0 and free[v + left]:
+            result.append(v + left)
+        return result
+
+    def path_cost(self, path):
+        """Returns the cost of walking the `(x, y)` cells of `path` from its first cell."""
+        return len(path) - 1
+
+    def __getitem__(self, cell):
+        return [self.cell(u) for u in self.neighbors(self.index(cell))]
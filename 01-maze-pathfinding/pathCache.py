@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class PathRecorder:
+    """Forwards observer calls (to `observer`, if any) and keeps the final path handed to show_path."""
+
+    def __init__(self, observer=None):
+        self.observer = observer
+        self.path = None
+
+    def visit(self, cell):
+        if self.observer is not None:
+            self.observer.visit(cell)
+
+    def expand(self, cell):
+        if self.observer is not None:
+            self.observer.expand(cell)
+
+    def show_path(self, path):
+        self.path = path
+        if self.observer is not None:
+            self.observer.show_path(path)
+
+
+class PathCache:
+    """
+    LRU cache of search results keyed by (maze fingerprint, start, goal,
+    algorithm).
+
+    An entry stores the (path_length, expanded_nodes, elapsed) result and the
+    path itself as an int32 array, so a hit can still draw the path on an
+    observer. Entries are evicted least recently used first once either
+    `max_entries` or `max_bytes` (approximate, counting the stored arrays) is
+    exceeded; None disables a limit.
+    """
+
+    # Rough fixed cost of one entry besides its path array
+    ENTRY_OVERHEAD = 256
+
+    def __init__(self, max_entries=1024, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def solve(self, algorithm, search, graph, start, goal, observer=None):
+        """
+        Returns the result of `search(graph, start, goal, observer)` for this
+        maze, computing and storing it on a miss. A hit expands no cells, so
+        it returns the stored path length with 0 expanded nodes and the time
+        the lookup itself took.
+        """
+        start_time = time.time()
+        key = (graph.fingerprint(), tuple(start), tuple(goal), algorithm)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            (path_length, _, _), path, _ = self.entries[key]
+            if observer is not None:
+                observer.show_path(None if path is None else [tuple(cell) for cell in path.tolist()])
+            return path_length, 0, time.time() - start_time
+
+        self.misses += 1
+        recorder = PathRecorder(observer)
+        result = search(graph, start, goal, recorder)
+        path = None if recorder.path is None else np.array(recorder.path, dtype=np.int32)
+        size = self.ENTRY_OVERHEAD + (0 if path is None else path.nbytes)
+        self.entries[key] = (result, path, size)
+        self.bytes += size
+        self._evict()
+        return result
+
+    def _evict(self):
+        while self.entries and (
+                (self.max_entries is not None and len(self.entries) > self.max_entries) or
+                (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, graph=None):
+        """
+        Drops every entry of the maze behind `graph` (a graph or a
+        fingerprint string), or the whole cache when no maze is given.
+        """
+        if graph is None:
+            self.entries.clear()
+            self.bytes = 0
+            return
+        fingerprint = graph if isinstance(graph, str) else graph.fingerprint()
+        for key in [key for key in self.entries if key[0] == fingerprint]:
+            _, _, size = self.entries.pop(key)
+            self.bytes -= size
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self.entries), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,122 @@
+"""
+Searches as event streams.
+
+search_events() runs any search with the (graph, start, goal, observer)
+contract on a worker thread. The search itself is unchanged; its observer
+calls are batched into compact events, put on a bounded queue and yielded
+to the consumer by search_events, which is a generator:
+
+    (FRONTIER, cells)   cells marked as searching, an (k, 2) int32 array
+    (EXPANDED, cells)   cells taken off the open set, same layout
+    (PATH, cells)       the next stretch of the final path, in order
+    (DONE, result)      the (path_length, expanded_nodes, elapsed) result
+
+Cells are sent in batches of up to `batch_size` (counting both kinds)
+through the queue, so a slow consumer (a renderer) pauses the search
+instead of letting events pile up in memory. The search's clock keeps
+running while it waits on a full queue, so the elapsed time in the DONE
+result includes that backpressure; run the search directly to time it.
+"""
+import queue
+import threading
+import numpy as np
+
+FRONTIER = "frontier"
+EXPANDED = "expanded"
+PATH = "path"
+DONE = "done"
+
+
+class _Cancelled(Exception):
+    """Raised inside the search thread once the consumer has stopped listening."""
+
+
+class _EventObserver:
+    """Observer that batches the calls of a search into queued events."""
+
+    def __init__(self, events, batch_size, stop):
+        self.events = events
+        self.batch_size = batch_size
+        self.stop = stop
+        self.frontier = []
+        self.expanded = []
+
+    def put(self, event):
+        while True:
+            if self.stop.is_set():
+                raise _Cancelled()
+            try:
+                self.events.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def flush(self):
+        # Frontier cells go first: a cell is always added before it is expanded
+        for kind, cells in ((FRONTIER, self.frontier), (EXPANDED, self.expanded)):
+            if cells:
+                self.put((kind, np.array(cells, dtype=np.int32).reshape(-1, 2)))
+        self.frontier = []
+        self.expanded = []
+
+    def visit(self, cell):
+        self.frontier.append(cell)
+        if len(self.frontier) + len(self.expanded) >= self.batch_size:
+            self.flush()
+
+    def expand(self, cell):
+        self.expanded.append(cell)
+        if len(self.frontier) + len(self.expanded) >= self.batch_size:
+            self.flush()
+
+    def show_path(self, path):
+        self.flush()
+        if path is None:
+            return
+        for start in range(0, len(path), self.batch_size):
+            self.put((PATH, np.array(path[start:start + self.batch_size], dtype=np.int32)))
+
+    def done(self, result):
+        self.flush()
+        self.put((DONE, result))
+
+
+def search_events(search, graph, start, goal, batch_size=256, max_batches=64):
+    """
+    Runs `search(graph, start, goal, observer)` on a worker thread and
+    yields its events from the queue the thread fills, at most `max_batches`
+    deep (see the module docstring). The last event is always
+    (DONE, result). Closing the generator early stops the search at its next
+    observer call.
+    """
+    events = queue.Queue(maxsize=max_batches)
+    stop = threading.Event()
+    observer = _EventObserver(events, batch_size, stop)
+    failure = []
+
+    def run():
+        try:
+            result = search(graph, start, goal, observer)
+            observer.done(result)
+        except _Cancelled:
+            pass
+        except BaseException as error:
+            failure.append(error)
+            try:
+                observer.put((None, None))
+            except _Cancelled:
+                pass
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, data = events.get()
+            if kind is None:
+                raise failure[0]
+            yield kind, data
+            if kind == DONE:
+                return
+    finally:
+        stop.set()
+        worker.join()
@@ -0,0 +1,135 @@
+import random
+import numpy as np
+
+# Zobrist keys per board size: _ZOBRIST[(rows, cols)][piece][bit]
+_ZOBRIST = {}
+
+
+def zobrist_keys(rows, cols):
+    """
+    Returns the random 64-bit key of every (piece, bit) of a board size. The
+    keys come from a fixed seed, so hashes are stable between runs.
+    """
+    if (rows, cols) not in _ZOBRIST:
+        rng = random.Random(rows * 1000 + cols)
+        bits = (rows + 1) * cols
+        _ZOBRIST[(rows, cols)] = [[rng.getrandbits(64) for _ in range(bits)] for _ in range(3)]
+    return _ZOBRIST[(rows, cols)]
+
+
+class Bitboard:
+    """
+    Connect Four position stored as one integer bitmask per player.
+
+    Column c owns bits c * (ROW_COUNT + 1) up to c * (ROW_COUNT + 1) + ROW_COUNT,
+    bottom row first; the extra top bit of every column is a sentinel that is
+    never set, so shifting a mask by one column (or one column plus or minus
+    one row) can never carry a line of stones from one column into the next.
+
+    Stones are indexed by piece number (`stones[PLAYER]`, `stones[AI]`), and
+    `heights[c]` is the bit index of the lowest empty cell of column c.
+    `hash` is the Zobrist hash of the stones, updated on every play and undo.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.stride = rows + 1
+        self.stones = [0, 0, 0]
+        self.heights = [c * self.stride for c in range(cols)]
+        self.count = 0
+        self.zobrist = zobrist_keys(rows, cols)
+        self.hash = 0
+        self.bottom = sum(1 << (c * self.stride) for c in range(cols))
+        self.top = self.bottom << rows  # The sentinel bits
+        self.cells = self.top - self.bottom  # Every playable cell
+        # Shifts that step one cell along a column, a row and both diagonals
+        self.directions = (1, self.stride, self.stride - 1, self.stride + 1)
+
+    def copy(self):
+        """Returns an independent copy of the position (sharing the Zobrist keys)."""
+        other = Bitboard.__new__(Bitboard)
+        other.__dict__.update(self.__dict__)
+        other.stones = self.stones[:]
+        other.heights = self.heights[:]
+        return other
+
+    @property
+    def mask(self):
+        """Bitmask of all occupied cells."""
+        return self.stones[1] | self.stones[2]
+
+    def can_play(self, col):
+        return self.heights[col] < col * self.stride + self.rows
+
+    def next_row(self, col):
+        """Row the next stone dropped in `col` lands on, or None if it is full."""
+        row = self.heights[col] - col * self.stride
+        return row if row < self.rows else None
+
+    def play(self, col, piece):
+        """Drops a stone of `piece` in `col` and returns its row."""
+        bit = self.heights[col]
+        self.stones[piece] |= 1 << bit
+        self.hash ^= self.zobrist[piece][bit]
+        self.heights[col] = bit + 1
+        self.count += 1
+        return bit - col * self.stride
+
+    def undo(self, col):
+        """Removes the top stone of `col`."""
+        bit = self.heights[col] - 1
+        piece = 1 if self.stones[1] >> bit & 1 else 2
+        self.stones[piece] &= ~(1 << bit)
+        self.hash ^= self.zobrist[piece][bit]
+        self.heights[col] = bit
+        self.count -= 1
+
+    def valid_mask(self):
+        """Bitmask of the cells a stone can be dropped on, one per open column."""
+        return (self.mask + self.bottom) & self.cells
+
+    def valid_moves(self):
+        """Columns that are not full, left to right."""
+        return [col for col in range(self.cols) if self.can_play(col)]
+
+    def is_win(self, piece):
+        """Whether `piece` has four in a row anywhere, by shift-and-AND per direction."""
+        stones = self.stones[piece]
+        for shift in self.directions:
+            pairs = stones & (stones >> shift)
+            if pairs & (pairs >> 2 * shift):
+                return True
+        return False
+
+    def is_full(self):
+        return self.count == self.rows * self.cols
+
+    def key(self):
+        """Integer that identifies the position (and whose stones are whose)."""
+        return self.stones[1] | (self.stones[2] << (self.stride * self.cols))
+
+    @classmethod
+    def from_array(cls, board):
+        """Builds the bitboard of a NumPy board (row 0 at the bottom, 0 = empty)."""
+        rows, cols = board.shape
+        bits = cls(rows, cols)
+        for col in range(cols):
+            for row in range(rows):
+                piece = int(board[row][col])
+                if piece == 0:
+                    break
+                bits.play(col, piece)
+        return bits
+
+    def to_array(self):
+        """Returns the position as a NumPy board like ConnectFourGame.board."""
+        board = np.zeros((self.rows, self.cols), dtype=int)
+        for piece in (1, 2):
+            stones = self.stones[piece]
+            for col in range(self.cols):
+                column = stones >> (col * self.stride)
+                for row in range(self.rows):
+                    if column >> row & 1:
+                        board[row][col] = piece
+        return board
@@ -0,0 +1,219 @@
+"""
+Opening book: precomputed best moves for the first plies of a game.
+
+The builder plays out every position reachable in up to `--ply` stones
+(the player moving first), keeps one of each pair of mirror images, searches
+each position `--depth` plies deep with negamax and writes the results to a
+binary file sorted by position key. At runtime OpeningBook memory-maps the
+file and finds a position with a binary search, so a book move costs
+microseconds instead of a full search.
+
+File layout (big-endian): a 24-byte header (magic, rows, cols, ply, depth,
+entry count), then the entry keys (16 bytes each, sorted), the best moves
+(1 byte each) and the scores (8 bytes each, from the AI's side like
+alpha_beta_pruning).
+
+A position key holds, per column, the stones of the first player below a
+single bit that marks the column's height, which needs (ROW_COUNT + 1) *
+COLUMN_COUNT bits: 42 for the 6x6 board and 90 for the 9x9 one.
+
+Example:
+    python book.py --rows 6 --cols 6 --ply 4 --depth 8
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+import numpy as np
+import engine
+from game import ConnectFourGame, PLAYER, AI
+from ordering import MoveOrderer
+from transposition import TranspositionTable
+from utils import attach_evaluator
+
+MAGIC = b"C4BOOK01"
+HEADER = struct.Struct(">8sHHHHQ")
+KEY_BYTES = 16
+
+# Directory the game looks for books in, one file per board size
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+
+def book_path(rows, cols):
+    return os.path.join(BOOK_DIR, f"book_{rows}x{cols}.bin")
+
+
+def position_key(bits):
+    """Compact key of a Bitboard position: the height bits plus the first player's stones."""
+    return (bits.mask + bits.bottom) | bits.stones[PLAYER]
+
+
+def mirror_key(key, rows, cols):
+    """Key of the position mirrored left to right."""
+    stride = rows + 1
+    column_mask = (1 << stride) - 1
+    mirrored = 0
+    for col in range(cols):
+        mirrored |= (key >> (col * stride) & column_mask) << ((cols - 1 - col) * stride)
+    return mirrored
+
+
+def canonical_key(bits):
+    """Returns the smaller key of the position and its mirror image, and whether it is the mirror's."""
+    key = position_key(bits)
+    mirrored = mirror_key(key, bits.rows, bits.cols)
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+def _key_bytes(key):
+    return np.array(key.to_bytes(KEY_BYTES, "big"), dtype=f"S{KEY_BYTES}")
+
+
+class OpeningBook:
+    """
+    Read-only view of a book file. The keys, moves and scores are memory-mapped,
+    so opening a book reads only the header and a lookup touches the pages of a
+    binary search.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            magic, self.rows, self.cols, self.ply, self.depth, self.size = HEADER.unpack(
+                file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        offset = HEADER.size
+        self.keys = np.memmap(path, dtype=f"S{KEY_BYTES}", mode="r", offset=offset, shape=(self.size,))
+        offset += KEY_BYTES * self.size
+        self.moves = np.memmap(path, dtype=np.int8, mode="r", offset=offset, shape=(self.size,))
+        offset += self.size
+        self.scores = np.memmap(path, dtype=">i8", mode="r", offset=offset, shape=(self.size,))
+
+    def lookup(self, game):
+        """
+        Returns (column, score) stored for the position of `game`, with the
+        column mirrored back if the book holds the mirror image, or None
+        when the position is not in the book.
+        """
+        bits = game.bits
+        if (bits.rows, bits.cols) != (self.rows, self.cols) or bits.count > self.ply or not self.size:
+            return None
+        key, mirrored = canonical_key(bits)
+        query = _key_bytes(key)
+        index = int(np.searchsorted(self.keys, query))
+        if index == self.size or self.keys[index] != query:
+            return None
+        column = int(self.moves[index])
+        if mirrored:
+            column = self.cols - 1 - column
+        return column, int(self.scores[index])
+
+
+def open_book(rows, cols):
+    """Opens the book of a board size from BOOK_DIR, or returns None if there is none."""
+    path = book_path(rows, cols)
+    return OpeningBook(path) if os.path.exists(path) else None
+
+
+def opening_positions(rows, cols, ply):
+    """
+    Returns {canonical key: move sequence} for every position reachable in up
+    to `ply` stones that is not already won or drawn, one per mirror pair. The
+    sequences play the canonical orientation of each position.
+    """
+    game = ConnectFourGame(rows, cols)
+    positions = {}
+    moves = []
+
+    def visit():
+        key, mirrored = canonical_key(game.bits)
+        if key in positions:
+            return  # Already expanded, or its mirror image was
+        positions[key] = [cols - 1 - col for col in moves] if mirrored else list(moves)
+        if len(moves) == ply:
+            return
+        piece = PLAYER if len(moves) % 2 == 0 else AI
+        for col in game.get_valid_locations():
+            row = game.get_next_open_row(col)
+            game.drop_piece(row, col, piece)
+            if not game.winning_move(piece) and not game.is_draw():
+                moves.append(col)
+                visit()
+                moves.pop()
+            game.undo_piece(row, col)
+
+    visit()
+    return positions
+
+
+def build_book(rows, cols, ply, depth, table_bytes=16 * 1024 * 1024, progress=None):
+    """
+    Searches every opening position `depth` plies deep and returns the
+    sorted (keys, moves, scores) arrays of the book, for the canonical
+    (smaller key) orientation of each position: evaluate_board scores the
+    column right of the middle as the center on even widths, so there a
+    position and its mirror image can get slightly different scores.
+    """
+    positions = opening_positions(rows, cols, ply)
+    table = TranspositionTable(table_bytes)
+    orderer = MoveOrderer(cols)
+    entries = []
+    for done, (key, moves) in enumerate(sorted(positions.items())):
+        game = ConnectFourGame(rows, cols)
+        attach_evaluator(game)
+        for index, col in enumerate(moves):
+            game.drop_piece(game.get_next_open_row(col), col, PLAYER if index % 2 == 0 else AI)
+        # The player moves first, so the AI is to move after an odd number of stones
+        color = 1 if len(moves) % 2 else -1
+        # Entries left by deeper searches of other positions would change the scores
+        table.clear()
+        column, score = engine.negamax(game, depth, -engine.INFINITY, engine.INFINITY, color,
+                                       table, orderer)
+        entries.append((key, column, color * score))
+        if progress is not None:
+            progress(done + 1, len(positions))
+    keys = np.array([key.to_bytes(KEY_BYTES, "big") for key, _, _ in entries], dtype=f"S{KEY_BYTES}")
+    moves = np.array([column for _, column, _ in entries], dtype=np.int8)
+    scores = np.array([score for _, _, score in entries], dtype=">i8")
+    return keys, moves, scores
+
+
+def write_book(path, rows, cols, ply, depth, keys, moves, scores):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, rows, cols, ply, depth, len(keys)))
+        file.write(keys.tobytes())
+        file.write(moves.tobytes())
+        file.write(scores.tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an opening book for one board size.")
+    parser.add_argument("--rows", type=int, default=6)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--ply", type=int, default=4, help="Book positions with up to this many stones")
+    parser.add_argument("--depth", type=int, default=8, help="Search depth of every book position")
+    parser.add_argument("--table-mb", type=int, default=16)
+    parser.add_argument("--out", help="Output file (default: books/book_<rows>x<cols>.bin)")
+    args = parser.parse_args(argv)
+    if (args.rows + 1) * args.cols > 8 * KEY_BYTES:
+        parser.error("the board is too large for 16-byte position keys")
+
+    def progress(done, total):
+        if done == total or done % 100 == 0:
+            print(f"\r{done}/{total} positions", end="", file=sys.stderr, flush=True)
+
+    begin = time.perf_counter()
+    keys, moves, scores = build_book(args.rows, args.cols, args.ply, args.depth,
+                                     args.table_mb * 1024 * 1024, progress)
+    path = args.out or book_path(args.rows, args.cols)
+    write_book(path, args.rows, args.cols, args.ply, args.depth, keys, moves, scores)
+    print(f"\nWrote {len(keys)} positions to {path} in {time.perf_counter() - begin:.1f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
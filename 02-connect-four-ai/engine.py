@@ -12,9 +12,52 @@ and return the best column to play.
 """
 
 import random
-from utils import evaluate_board
+import time
+from utils import evaluate_board, attach_evaluator
 from game import ConnectFourGame, PLAYER, AI
+from transposition import EXACT, LOWER, UPPER, SIDE_KEY, TranspositionTable
+from ordering import MoveOrderer
 ROW_COUNT, COLUMN_COUNT = 6,6
+
+# Score of a won position, and a bound beyond every score for the integer
+# windows of negamax and MTD(f)
+WIN_SCORE = 100000000000000
+INFINITY = 2 * WIN_SCORE
+
+# Positions visited by the searches since the last reset_node_count()
+node_count = 0
+
+
+def reset_node_count():
+    global node_count
+    node_count = 0
+
+
+class SearchTimeout(Exception):
+    """Raised inside alpha_beta_pruning once the iterative_deepening deadline passes."""
+
+
+# Deadline (perf_counter seconds) and poll callback of the running
+# iterative_deepening call; checked every POLL_INTERVAL nodes
+_deadline = None
+_poll = None
+POLL_INTERVAL = 64
+
+
+def _check_deadline():
+    if _poll is not None:
+        _poll()
+    if time.perf_counter() >= _deadline:
+        raise SearchTimeout()
+
+
+def _evaluate(game):
+    """evaluate_board(game.board, AI), read from the game's incremental evaluator when it has one."""
+    if game.evaluator is not None and game.evaluator.piece == AI:
+        return game.evaluator.score()
+    return evaluate_board(game.board, AI)
+
+
 def minimax(game, depth, maximizing_player):
     """
     Minimax algorithm to determine the best move.
@@ -24,19 +67,21 @@ def minimax(game, depth, maximizing_player):
     :param maximizing_player: Boolean indicating if AI is maximizing.
     :return: Best column to play and its score.
     """
+    global node_count
+    node_count += 1
     valid_locations = game.get_valid_locations()
     is_terminal = game.winning_move(PLAYER) or game.winning_move(AI) or game.is_draw()
     
     if depth == 0 or is_terminal:
         if is_terminal:
             if game.winning_move(AI):
-                return (None, 100000000000000)
+                return (None, WIN_SCORE)
             elif game.winning_move(PLAYER):
-                return (None, -100000000000000)
+                return (None, -WIN_SCORE)
             else:  # Draw
                 return (None, 0)
         else:  # Depth is zero
-            return (None, evaluate_board(game.board, AI))
+            return (None, _evaluate(game))
     
     if maximizing_player:
         value = -float('inf')
@@ -45,7 +90,7 @@ def minimax(game, depth, maximizing_player):
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, AI)
             new_score = minimax(game, depth - 1, False)[1]
-            game.board[row][col] = 0  # Undo the move
+            game.undo_piece(row, col)
             if new_score > value:
                 value = new_score
                 column = col
@@ -58,14 +103,14 @@ def minimax(game, depth, maximizing_player):
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, PLAYER)
             new_score = minimax(game, depth - 1, True)[1]
-            game.board[row][col] = 0  # Undo the move
+            game.undo_piece(row, col)
             if new_score < value:
                 value = new_score
                 column = col
         return column, value
 
 
-def alpha_beta_pruning(game, depth, alpha, beta, maximizing_player):
+def alpha_beta_pruning(game, depth, alpha, beta, maximizing_player, table=None, orderer=None):
     """
     Alpha-Beta Pruning to optimize Minimax.
 
@@ -74,21 +119,51 @@ def alpha_beta_pruning(game, depth, alpha, beta, maximizing_player):
     :param alpha: Alpha value.
     :param beta: Beta value.
     :param maximizing_player: Boolean indicating if AI is maximizing.
+    :param table: Optional TranspositionTable; positions already searched
+        deep enough are answered from it and its best move is tried first.
+    :param orderer: Optional MoveOrderer that decides the order moves are
+        searched in and learns from the cutoffs.
     :return: Best column to play and its score.
     """
+    global node_count
+    node_count += 1
+    if _deadline is not None and node_count % POLL_INTERVAL == 0:
+        _check_deadline()
     valid_locations = game.get_valid_locations()
     is_terminal = game.winning_move(PLAYER) or game.winning_move(AI) or game.is_draw()
     
     if depth == 0 or is_terminal:
         if is_terminal:
             if game.winning_move(AI):
-                return (None, 100000000000000)
+                return (None, WIN_SCORE)
             elif game.winning_move(PLAYER):
-                return (None, -100000000000000)
+                return (None, -WIN_SCORE)
             else:  # Draw
                 return (None, 0)
         else:  # Depth is zero
-            return (None, evaluate_board(game.board, AI))
+            return (None, _evaluate(game))
+
+    alpha_orig, beta_orig = alpha, beta
+    stored_move = None
+    if table is not None:
+        key = game.bits.hash ^ (SIDE_KEY if maximizing_player else 0)
+        entry = table.probe(key)
+        if entry is not None:
+            stored_depth, flag, stored_score, stored_move = entry
+            if stored_depth >= depth:
+                if flag == EXACT:
+                    return stored_move, stored_score
+                if flag == LOWER:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if alpha >= beta:
+                    return stored_move, stored_score
+    if orderer is not None:
+        valid_locations = orderer.order(game, valid_locations, stored_move)
+    elif stored_move in valid_locations:
+        valid_locations.remove(stored_move)
+        valid_locations.insert(0, stored_move)
     
     if maximizing_player:
         value = -float('inf')
@@ -96,15 +171,16 @@ def alpha_beta_pruning(game, depth, alpha, beta, maximizing_player):
         for col in valid_locations:
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, AI)
-            new_score = alpha_beta_pruning(game, depth - 1, alpha, beta, False)[1]
-            game.board[row][col] = 0  # Undo the move
+            new_score = alpha_beta_pruning(game, depth - 1, alpha, beta, False, table, orderer)[1]
+            game.undo_piece(row, col)
             if new_score > value:
                 value = new_score
                 column = col
             alpha = max(alpha, value)
             if alpha >= beta:
+                if orderer is not None:
+                    orderer.cutoff(game, col, depth)
                 break
-        return column, value
     
     else:  # Minimizing player
         value = float('inf')
@@ -112,15 +188,26 @@ def alpha_beta_pruning(game, depth, alpha, beta, maximizing_player):
         for col in valid_locations:
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, PLAYER)
-            new_score = alpha_beta_pruning(game, depth - 1, alpha, beta, True)[1]
-            game.board[row][col] = 0  # Undo the move
+            new_score = alpha_beta_pruning(game, depth - 1, alpha, beta, True, table, orderer)[1]
+            game.undo_piece(row, col)
             if new_score < value:
                 value = new_score
                 column = col
             beta = min(beta, value)
             if alpha >= beta:
+                if orderer is not None:
+                    orderer.cutoff(game, col, depth)
                 break
-        return column, value
+
+    if table is not None:
+        if value <= alpha_orig:
+            flag = UPPER
+        elif value >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        table.store(key, depth, flag, value, column)
+    return column, value
 
 
 def expectimax(game, depth, maximizing_player):
@@ -132,19 +219,21 @@ def expectimax(game, depth, maximizing_player):
     :param maximizing_player: Boolean indicating if AI is maximizing.
     :return: Best column to play and its score.
     """
+    global node_count
+    node_count += 1
     valid_locations = game.get_valid_locations()
     is_terminal = game.winning_move(PLAYER) or game.winning_move(AI) or game.is_draw()
     
     if depth == 0 or is_terminal:
         if is_terminal:
             if game.winning_move(AI):
-                return (None, 100000000000000)
+                return (None, WIN_SCORE)
             elif game.winning_move(PLAYER):
-                return (None, -100000000000000)
+                return (None, -WIN_SCORE)
             else:  # Draw
                 return (None, 0)
         else:  # Depth is zero
-            return (None, evaluate_board(game.board, AI))
+            return (None, _evaluate(game))
     
     if maximizing_player:
         value = -float('inf')
@@ -153,7 +242,7 @@ def expectimax(game, depth, maximizing_player):
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, AI)
             new_score = expectimax(game, depth - 1, False)[1]
-            game.board[row][col] = 0  # Undo the move
+            game.undo_piece(row, col)
             if new_score > value:
                 value = new_score
                 column = col
@@ -166,6 +255,171 @@ def expectimax(game, depth, maximizing_player):
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, PLAYER)
             new_score = expectimax(game, depth - 1, True)[1]
-            game.board[row][col] = 0  # Undo the move
+            game.undo_piece(row, col)
             value += new_score * (1.0 / len(valid_locations))  # Average the scores
-        return column, value
\ No newline at end of file
+        return column, value
+
+
+def negamax(game, depth, alpha, beta, color, table=None, orderer=None):
+    """
+    Negamax with principal-variation search: one routine for both players,
+    scoring positions from the side to move (color 1: AI, -1: PLAYER), so
+    alpha_beta_pruning(game, depth, alpha, beta, True)[1] equals
+    negamax(game, depth, alpha, beta, 1)[1] for the same window.
+
+    The first move is searched with the full window; every later move first
+    with a null window (-alpha - 1, -alpha) that only tests whether it beats
+    the best so far, and again with the full window only when it does. The
+    search is fail-soft and all scores are integers, as MTD(f) needs.
+
+    :param table: Optional TranspositionTable (do not share one with
+        alpha_beta_pruning, whose scores are from the AI's side).
+    :param orderer: Optional MoveOrderer.
+    :return: Best column to play and its score for the side to move.
+    """
+    global node_count
+    node_count += 1
+    if _deadline is not None and node_count % POLL_INTERVAL == 0:
+        _check_deadline()
+    if game.winning_move(AI):
+        return None, color * WIN_SCORE
+    if game.winning_move(PLAYER):
+        return None, -color * WIN_SCORE
+    if game.is_draw():
+        return None, 0
+    if depth == 0:
+        return None, color * _evaluate(game)
+
+    alpha_orig = alpha
+    stored_move = None
+    if table is not None:
+        key = game.bits.hash ^ (SIDE_KEY if color == 1 else 0)
+        entry = table.probe(key)
+        if entry is not None:
+            stored_depth, flag, stored_score, stored_move = entry
+            if stored_depth >= depth:
+                if flag == EXACT:
+                    return stored_move, stored_score
+                if flag == LOWER:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if alpha >= beta:
+                    return stored_move, stored_score
+    valid_locations = game.get_valid_locations()
+    if orderer is not None:
+        valid_locations = orderer.order(game, valid_locations, stored_move)
+    elif stored_move in valid_locations:
+        valid_locations.remove(stored_move)
+        valid_locations.insert(0, stored_move)
+
+    piece = AI if color == 1 else PLAYER
+    value = -INFINITY
+    column = valid_locations[0]
+    for index, col in enumerate(valid_locations):
+        row = game.get_next_open_row(col)
+        game.drop_piece(row, col, piece)
+        if index == 0:
+            score = -negamax(game, depth - 1, -beta, -alpha, -color, table, orderer)[1]
+        else:
+            score = -negamax(game, depth - 1, -alpha - 1, -alpha, -color, table, orderer)[1]
+            if alpha < score < beta:
+                score = -negamax(game, depth - 1, -beta, -alpha, -color, table, orderer)[1]
+        game.undo_piece(row, col)
+        if score > value:
+            value = score
+            column = col
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            if orderer is not None:
+                orderer.cutoff(game, col, depth)
+            break
+
+    if table is not None:
+        if value <= alpha_orig:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        table.store(key, depth, flag, value, column)
+    return column, value
+
+
+def mtdf(game, depth, guess=0, maximizing_player=True, table=None, orderer=None):
+    """
+    MTD(f): finds the negamax score of `game` with a series of null-window
+    negamax calls, each telling whether the score is above or below a test
+    value, and moves the test value to the bound it got back until the lower
+    and upper bounds meet. The transposition table keeps the passes from
+    repeating each other's work, and a `guess` close to the score (such as
+    the score of the previous depth) keeps the number of passes small.
+
+    :return: Best column to play, its score (from the AI's side like
+        alpha_beta_pruning) and the number of passes.
+    """
+    if table is None:
+        table = TranspositionTable()
+    color = 1 if maximizing_player else -1
+    score = color * guess
+    lower, upper = -INFINITY, INFINITY
+    column = None
+    passes = 0
+    while lower < upper:
+        beta = score + 1 if score == lower else score
+        move, score = negamax(game, depth, beta - 1, beta, color, table, orderer)
+        passes += 1
+        if score < beta:
+            upper = score
+        else:
+            lower = score
+            column = move  # Proven to reach at least the final score
+    if column is None:
+        column = game.get_valid_locations()[0] if game.get_valid_locations() else None
+    return column, color * score, passes
+
+
+def iterative_deepening(game, time_limit_ms, maximizing_player=True, table=None, orderer=None,
+                        max_depth=None, poll=None):
+    """
+    Searches depth 1, 2, 3, ... with alpha_beta_pruning until `time_limit_ms`
+    runs out and returns the move of the last depth that finished.
+
+    The transposition table carries each iteration's best moves into the
+    next one, so the previous principal variation is searched first. Depth 1
+    always finishes, so a move is always returned; deeper iterations are
+    abandoned as soon as the deadline passes. `poll` (e.g. pygame.event.pump)
+    is called every POLL_INTERVAL nodes to keep a GUI responsive.
+
+    :return: Best column, its score and the depth it was searched to.
+    """
+    global _deadline, _poll
+    if table is None:
+        table = TranspositionTable()
+    if orderer is None:
+        orderer = MoveOrderer(game.COLUMN_COUNT)
+    if game.evaluator is None:
+        attach_evaluator(game)
+    table.new_search()
+    start = time.perf_counter()
+    empty_cells = game.ROW_COUNT * game.COLUMN_COUNT - game.bits.count
+    max_depth = empty_cells if max_depth is None else min(max_depth, empty_cells)
+    board, bits = game.board.copy(), game.bits.copy()
+
+    column, score = alpha_beta_pruning(game, 1, -float('inf'), float('inf'), maximizing_player,
+                                       table, orderer)
+    depth = 1
+    _deadline, _poll = start + time_limit_ms / 1000, poll
+    try:
+        while depth < max_depth and abs(score) < WIN_SCORE:
+            column, score = alpha_beta_pruning(game, depth + 1, -float('inf'), float('inf'),
+                                               maximizing_player, table, orderer)
+            depth += 1
+    except SearchTimeout:
+        # The interrupted search left its moves on the board
+        game.board, game.bits = board, bits
+        if game.evaluator is not None:
+            game.evaluator.load(board)
+    finally:
+        _deadline, _poll = None, None
+    return column, score, depth
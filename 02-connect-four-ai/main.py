@@ -4,6 +4,33 @@ import pygame
 from game import ConnectFourGame, PLAYER, AI
 from gui import ConnectFourGUI, RADIUS, SQUARESIZE
 import engine
+from transposition import TranspositionTable
+from ordering import MoveOrderer
+from utils import attach_evaluator
+from book import open_book
+
+# Memory of the transposition table each AI search shares between its moves
+TABLE_BYTES = 16 * 1024 * 1024
+
+# Wall-clock budget of one AI move; the search deepens until it runs out
+AI_TIME_MS = 1000
+
+
+def ai_move(game, table, orderer, book):
+    """
+    Column for the side to move: the opening book's move while the position
+    is in the book, otherwise the move of a time-limited search. Red (PLAYER)
+    always moves first, so Yellow (AI, the maximizing side) is to move after
+    an odd number of stones; the book makes the same assumption.
+    """
+    entry = book.lookup(game) if book is not None else None
+    if entry is not None:
+        return entry[0]
+    maximizing_player = game.bits.count % 2 == 1
+    col, _, _ = engine.iterative_deepening(game, AI_TIME_MS, maximizing_player=maximizing_player,
+                                           table=table, orderer=orderer, poll=pygame.event.pump)
+    return col
+
 
 def main():
     # Initialize the game and GUI
@@ -13,6 +40,7 @@ def main():
     mode = gui.menu_loop()
     ROW_COUNT, COLUMN_COUNT = gui.get_board_size()  # Retrieve the updated board size from GUI
     game = ConnectFourGame(ROW_COUNT, COLUMN_COUNT)  # Pass these values to the game initialization
+    attach_evaluator(game)  # Keeps the AI's board evaluation up to date move by move
     # Start the selected game mode
     if mode == 'human':
         run_human_vs_human(game, gui)
@@ -113,6 +141,9 @@ def run_player_vs_ai(game, gui):
     turn = 0  # Player goes first
     game_over = False
     game.reset()
+    table = TranspositionTable(TABLE_BYTES)
+    orderer = MoveOrderer(game.COLUMN_COUNT)
+    book = open_book(game.ROW_COUNT, game.COLUMN_COUNT)  # None when no book was built for this size
     gui.draw_board(game.board)
     pygame.display.update()
 
@@ -157,8 +188,8 @@ def run_player_vs_ai(game, gui):
 
         # AI Turn
         if turn == 1 and not game.game_over:
-            col, _ = engine.minimax(game, depth=4, maximizing_player=True)
-            # col, _ = engine.alpha_beta_pruning(game, depth=4, alpha=-float('inf'), beta=float('inf'), maximizing_player=True)
+            col = ai_move(game, table, orderer, book)
+            # col, _ = engine.minimax(game, depth=4, maximizing_player=True)
             # col, _ = engine.expectimax(game, depth=4, maximizing_player=True)
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, AI)
@@ -197,6 +228,9 @@ def run_ai_vs_ai(game, gui):
     turn = 0  # AI 1 (Red) goes first
     game_over = False
     game.reset()
+    table = TranspositionTable(TABLE_BYTES)
+    orderer = MoveOrderer(game.COLUMN_COUNT)
+    book = open_book(game.ROW_COUNT, game.COLUMN_COUNT)  # None when no book was built for this size
     gui.draw_board(game.board)
     pygame.display.update()
 
@@ -206,10 +240,10 @@ def run_ai_vs_ai(game, gui):
                 pygame.quit()
                 sys.exit()
 
-        # AI 1's Turn
+        # AI 1's Turn (Minimizing Player, dropping the PLAYER pieces)
         if turn == 0 and not game.game_over:
 
-            col, _ = engine.alpha_beta_pruning(game, depth=1, alpha=-float('inf'), beta=float('inf'), maximizing_player=True)
+            col = ai_move(game, table, orderer, book)
             # col, _ = engine.expectimax(game, depth=4, maximizing_player=True)
             row = game.get_next_open_row(col)
 
@@ -232,9 +266,9 @@ def run_ai_vs_ai(game, gui):
             gui.draw_board(game.board)
             turn = 1  # Switch to AI 2
 
-        # AI 2's Turn (Minimizing Player using Alpha-Beta)
+        # AI 2's Turn (Maximizing Player, dropping the AI pieces)
         if turn == 1 and not game.game_over:
-            col, _ = engine.alpha_beta_pruning(game, depth=1, alpha=-float('inf'), beta=float('inf'), maximizing_player=False)
+            col = ai_move(game, table, orderer, book)
             row = game.get_next_open_row(col)
             game.drop_piece(row, col, AI)  # AI 2 uses Yellow pieces
 
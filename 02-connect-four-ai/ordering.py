@@ -0,0 +1,60 @@
+class MoveOrderer:
+    """
+    Orders the moves of an alpha-beta node so the ones most likely to cause a
+    cutoff are searched first:
+
+    1. the best move stored in the transposition table for the position,
+    2. the killer moves: the last (up to two) moves that caused a cutoff at
+       the same ply, which often refute sibling positions as well,
+    3. the rest by their history score (the sum of depth^2 over every cutoff
+       the move caused from the same landing cell), then center-out, since
+       central columns take part in the most four-in-a-row windows.
+
+    Plies are counted in stones on the board, so killers and history stay
+    useful from one move of a game to the next. Each stage can be switched
+    off to measure what it contributes.
+    """
+
+    def __init__(self, cols, killers=True, history=True):
+        self.use_killers = killers
+        self.use_history = history
+        # Distance to the center, doubled so even widths need no fractions
+        self.center_rank = [abs(2 * col - (cols - 1)) for col in range(cols)]
+        self.killers = {}
+        self.history = {}
+
+    def order(self, game, moves, tt_move=None):
+        """Returns `moves` (columns) in the order they should be searched."""
+        bits = game.bits
+        if self.use_history:
+            history = self.history
+            heights = bits.heights
+            ordered = sorted(moves, key=lambda col: (-history.get(heights[col], 0), self.center_rank[col]))
+        else:
+            ordered = sorted(moves, key=self.center_rank.__getitem__)
+        first = []
+        if tt_move is not None and tt_move in ordered:
+            first.append(tt_move)
+        if self.use_killers:
+            for killer in self.killers.get(bits.count, ()):
+                if killer in ordered and killer not in first:
+                    first.append(killer)
+        if first:
+            ordered = first + [col for col in ordered if col not in first]
+        return ordered
+
+    def cutoff(self, game, col, depth):
+        """Records that `col` caused a beta cutoff at `depth` plies from the horizon."""
+        ply = game.bits.count
+        if self.use_killers:
+            killers = self.killers.setdefault(ply, [])
+            if col not in killers:
+                killers.insert(0, col)
+                del killers[2:]
+        if self.use_history:
+            cell = game.bits.heights[col]
+            self.history[cell] = self.history.get(cell, 0) + depth * depth
+
+    def clear(self):
+        self.killers.clear()
+        self.history.clear()
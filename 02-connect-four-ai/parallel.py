@@ -0,0 +1,143 @@
+"""
+Root-split parallel alpha-beta search.
+
+The first root move (the center-most, usually the best) is searched in the
+calling process to get a good bound; the remaining moves are then searched
+in a process pool, each worker with its own transposition table and move
+orderer. The best score found so far is shared through a multiprocessing
+Value, and every move starts its search from that bound.
+
+Each move is searched with the window just outside the shared best score
+(best - 1 for the maximizing side), so a move that ties the best is scored
+exactly, and the move picked is the first one in left-to-right order with
+the best score: the same move and score as
+alpha_beta_pruning(game, depth, -inf, inf, maximizing_player).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value
+import engine
+from bitboard import Bitboard
+from game import ConnectFourGame, PLAYER, AI
+from ordering import MoveOrderer
+from transposition import TranspositionTable
+from utils import attach_evaluator
+
+# Stands for an infinite bound in the shared int64 value
+NO_BOUND = -(1 << 62)
+
+# Per-worker state, set by _init_worker
+_best = None
+_table = None
+_orderers = {}
+_search_id = None
+
+
+def _init_worker(best, table_bytes):
+    global _best, _table
+    _best = best
+    _table = TranspositionTable(table_bytes)
+
+
+def _search_move(board, col, depth, maximizing_player, table, orderer, best):
+    """
+    Plays `col` on a copy of `board` and searches the reply position with a
+    window just outside the shared best score. Returns (col, score, nodes).
+    """
+    rows, cols = board.shape
+    game = ConnectFourGame(rows, cols)
+    game.board = board.copy()
+    game.bits = Bitboard.from_array(game.board)
+    attach_evaluator(game)
+    game.drop_piece(game.get_next_open_row(col), col, AI if maximizing_player else PLAYER)
+
+    bound = best.value
+    alpha, beta = -float('inf'), float('inf')
+    if bound != NO_BOUND:
+        # Signs are flipped for the minimizing side, see ParallelSearcher.search
+        if maximizing_player:
+            alpha = bound - 1
+        else:
+            beta = -bound + 1
+    engine.reset_node_count()
+    _, score = engine.alpha_beta_pruning(game, depth - 1, alpha, beta, not maximizing_player,
+                                         table, orderer)
+    _raise_best(best, score if maximizing_player else -score)
+    return col, score, engine.node_count
+
+
+def _raise_best(best, score):
+    with best.get_lock():
+        if best.value == NO_BOUND or score > best.value:
+            best.value = score
+
+
+def _worker_search(search_id, board, col, depth, maximizing_player):
+    global _search_id
+    if search_id != _search_id:
+        # Entries from an earlier (deeper) search would change the scores
+        _table.clear()
+        _search_id = search_id
+    cols = board.shape[1]
+    if cols not in _orderers:
+        _orderers[cols] = MoveOrderer(cols)
+    return _search_move(board, col, depth, maximizing_player, _table, _orderers[cols], _best)
+
+
+class ParallelSearcher:
+    """
+    Process pool for root-split searches. Keep one for a whole game, so the
+    workers' tables and orderers stay warm between moves, and close() it (or
+    use it as a context manager) when done.
+    """
+
+    def __init__(self, max_workers=None, table_bytes=16 * 1024 * 1024):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Best root score so far, negated when the root is minimizing
+        self.best = Value('q', NO_BOUND)
+        self.table = TranspositionTable(table_bytes)
+        self.orderer = None
+        self.searches = 0
+        self.executor = ProcessPoolExecutor(self.max_workers, initializer=_init_worker,
+                                            initargs=(self.best, table_bytes))
+
+    def search(self, game, depth, maximizing_player=True):
+        """
+        Returns (best column, score, nodes) for `game` searched `depth` plies
+        deep; the column and score are those of the serial search.
+        """
+        moves = game.get_valid_locations()
+        if depth == 0 or not moves or game.winning_move(PLAYER) or game.winning_move(AI):
+            return engine.alpha_beta_pruning(game, depth, -float('inf'), float('inf'),
+                                             maximizing_player) + (1,)
+        if self.orderer is None or len(self.orderer.center_rank) != game.COLUMN_COUNT:
+            self.orderer = MoveOrderer(game.COLUMN_COUNT)
+        # Within one search a position is always reached with the same depth
+        # left, so the tables only have to be emptied between searches
+        self.table.clear()
+        self.searches += 1
+        self.best.value = NO_BOUND
+        board = game.board.copy()
+
+        ordered = self.orderer.order(game, moves)
+        eldest = _search_move(board, ordered[0], depth, maximizing_player, self.table,
+                              self.orderer, self.best)
+        futures = [self.executor.submit(_worker_search, self.searches, board, col, depth,
+                                        maximizing_player)
+                   for col in ordered[1:]]
+        results = [eldest] + [future.result() for future in futures]
+
+        scores = {col: score for col, score, _ in results}
+        nodes = sum(count for _, _, count in results) + 1
+        best_score = max(scores.values()) if maximizing_player else min(scores.values())
+        column = next(col for col in moves if scores[col] == best_score)
+        return column, best_score, nodes
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+
+# Bound types of a stored score (0 marks an empty slot)
+EXACT = 1
+LOWER = 2  # The true score is at least the stored one (fail high)
+UPPER = 3  # The true score is at most the stored one (fail low)
+
+# XORed into a position hash when the maximizing player is to move
+SIDE_KEY = random.Random(0).getrandbits(64)
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hashes.
+
+    Entries live in parallel NumPy arrays (full 64-bit key, score, remaining
+    depth, bound type, best move and search generation), 20 bytes per slot.
+    The slot count is the largest power of two that fits `memory_bytes`, and
+    a hash maps to slot `hash & (size - 1)`.
+
+    Replacement: a slot is overwritten when it is empty, holds the same
+    position, was written during an older search (see new_search) or holds a
+    shallower search than the new entry; otherwise the deeper entry is kept.
+    """
+
+    ENTRY_BYTES = 8 + 8 + 1 + 1 + 1 + 1
+
+    def __init__(self, memory_bytes=16 * 1024 * 1024):
+        slots = max(1, memory_bytes // self.ENTRY_BYTES)
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.keys = np.zeros(self.size, dtype=np.uint64)
+        self.scores = np.zeros(self.size, dtype=np.int64)
+        self.depths = np.zeros(self.size, dtype=np.int8)
+        self.flags = np.zeros(self.size, dtype=np.int8)
+        self.moves = np.full(self.size, -1, dtype=np.int8)
+        self.generations = np.zeros(self.size, dtype=np.uint8)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Marks every stored entry as belonging to an older search."""
+        self.generation = (self.generation + 1) % 256
+
+    def probe(self, key):
+        """Returns (depth, flag, score, move) stored for `key`, or None."""
+        self.probes += 1
+        slot = key & self.mask
+        if self.flags[slot] == 0 or int(self.keys[slot]) != key:
+            return None
+        self.hits += 1
+        move = int(self.moves[slot])
+        return (int(self.depths[slot]), int(self.flags[slot]), int(self.scores[slot]),
+                None if move < 0 else move)
+
+    def store(self, key, depth, flag, score, move):
+        slot = key & self.mask
+        if self.flags[slot] != 0 and int(self.keys[slot]) != key:
+            if self.generations[slot] == self.generation and self.depths[slot] > depth:
+                return  # Keep the deeper entry of the current search
+            self.replacements += 1
+        self.keys[slot] = key
+        self.scores[slot] = score
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        self.moves[slot] = -1 if move is None else move
+        self.generations[slot] = self.generation
+        self.stores += 1
+
+    def clear(self):
+        self.flags[:] = 0
+        self.probes = self.hits = self.stores = self.replacements = 0
+
+    def stats(self):
+        """Probe/hit counts, the hit rate and the fraction of slots in use."""
+        return {"slots": self.size, "probes": self.probes, "hits": self.hits,
+                "hit_rate": self.hits / self.probes if self.probes else 0.0,
+                "stores": self.stores, "replacements": self.replacements,
+                "fill": float(np.count_nonzero(self.flags)) / self.size}
@@ -65,4 +65,104 @@ def evaluate_board(board, piece):
             window = [board[r - i][c + i] for i in range(4)]
             score += evaluate_window(window, piece)
 
-    return score
\ No newline at end of file
+    return score
+
+
+def _window_score(own, opp):
+    """evaluate_window for a window holding `own` pieces of the player and `opp` of the opponent."""
+    empty = 4 - own - opp
+    score = 0
+    if own == 4:
+        score += 100
+    elif own == 3 and empty == 1:
+        score += 5
+    elif own == 2 and empty == 2:
+        score += 2
+    if opp == 3 and empty == 1:
+        score -= 4
+    return score
+
+
+class IncrementalEvaluator:
+    """
+    Keeps evaluate_board(board, piece) up to date move by move.
+
+    Every window of four cells scored by evaluate_board gets an id, and each
+    cell lists the windows through it. The evaluator stores the number of
+    stones of each player per window and the running total; a drop or undo
+    only rescores the (at most 16) windows through the changed cell, so
+    reading the score at a leaf is O(1).
+    """
+
+    def __init__(self, rows, cols, piece=AI):
+        self.rows = rows
+        self.cols = cols
+        self.piece = piece
+        self.center = cols // 2
+        windows = []
+        for r in range(rows):
+            for c in range(cols - 3):
+                windows.append([(r, c + i) for i in range(4)])
+        for c in range(cols):
+            for r in range(rows - 3):
+                windows.append([(r + i, c) for i in range(4)])
+        for r in range(rows - 3):
+            for c in range(cols - 3):
+                windows.append([(r + i, c + i) for i in range(4)])
+        for r in range(3, rows):
+            for c in range(cols - 3):
+                windows.append([(r - i, c + i) for i in range(4)])
+        self.cell_windows = [[] for _ in range(rows * cols)]
+        for window, cells in enumerate(windows):
+            for r, c in cells:
+                self.cell_windows[r * cols + c].append(window)
+        # SCORES[own][opp] as in evaluate_window
+        self.scores = [[_window_score(own, opp) if own + opp <= 4 else 0 for opp in range(5)]
+                       for own in range(5)]
+        self.window_count = len(windows)
+        self.clear()
+
+    def clear(self):
+        """Resets to the empty board."""
+        self.counts = [None, [0] * self.window_count, [0] * self.window_count]
+        self.value = 0
+
+    def load(self, board):
+        """Resets to the position of a NumPy board."""
+        self.clear()
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if board[r][c]:
+                    self.play(r, c, int(board[r][c]))
+
+    def _update(self, row, col, piece, delta):
+        own = self.counts[self.piece]
+        opp = self.counts[PLAYER if self.piece == AI else AI]
+        changed = own if piece == self.piece else opp
+        scores = self.scores
+        value = self.value
+        for window in self.cell_windows[row * self.cols + col]:
+            before = scores[own[window]][opp[window]]
+            changed[window] += delta
+            value += scores[own[window]][opp[window]] - before
+        if col == self.center and piece == self.piece:
+            value += 3 * delta
+        self.value = value
+
+    def play(self, row, col, piece):
+        self._update(row, col, piece, 1)
+
+    def undo(self, row, col, piece):
+        self._update(row, col, piece, -1)
+
+    def score(self):
+        """Same value as evaluate_board(board, piece) for the current board."""
+        return self.value
+
+
+def attach_evaluator(game, piece=AI):
+    """Gives `game` an IncrementalEvaluator synced with its board and returns it."""
+    evaluator = IncrementalEvaluator(game.ROW_COUNT, game.COLUMN_COUNT, piece)
+    evaluator.load(game.board)
+    game.evaluator = evaluator
+    return evaluator